@@ -37,6 +37,7 @@ logger = logging.getLogger(__name__)
 MONGODB_URI = os.getenv("MONGODB_URI")
 MONGODB_DATABASE = os.getenv("MONGODB_DATABASE", "Resume_study")
 MONGODB_COLLECTION = "Job_postings_greenhouse"
+CURSOR_BATCH_SIZE = 500
 
 class JobDescriptionLengthAnalyzer:
     def __init__(self):
@@ -88,10 +89,11 @@ class JobDescriptionLengthAnalyzer:
         """Analyze all job descriptions and return statistics"""
         logger.info("Starting job description length analysis...")
         
-        # Get all jobs with job_description field
-        jobs_with_descriptions = list(self.collection.find({
-            "job_description": {"$exists": True, "$ne": None, "$ne": ""}
-        }))
+        # Stream jobs with job_description field (only the fields analysed below)
+        jobs_with_descriptions = self.collection.find(
+            {"job_description": {"$exists": True, "$ne": None, "$ne": ""}},
+            {"title": 1, "company": 1, "job_description": 1, "jd_extraction": 1, "job_link": 1}
+        ).batch_size(CURSOR_BATCH_SIZE)
         
         # Get all jobs without job_description field
         jobs_without_descriptions = self.collection.count_documents({
@@ -102,11 +104,7 @@ class JobDescriptionLengthAnalyzer:
             ]
         })
         
-        total_jobs = self.collection.count_documents({})
-        
-        logger.info(f"Found {len(jobs_with_descriptions)} jobs with descriptions")
-        logger.info(f"Found {jobs_without_descriptions} jobs without descriptions")
-        logger.info(f"Total jobs in collection: {total_jobs}")
+        total_jobs = self.collection.estimated_document_count()
         
         # Analyze lengths
         length_data = []
@@ -172,6 +170,10 @@ class JobDescriptionLengthAnalyzer:
                 'job_link': job.get('job_link', 'N/A')
             })
         
+        logger.info(f"Found {len(length_data)} jobs with descriptions")
+        logger.info(f"Found {jobs_without_descriptions} jobs without descriptions")
+        logger.info(f"Total jobs in collection: {total_jobs}")
+        
         # Calculate statistics
         if word_counts:
             word_stats = {
@@ -195,7 +197,7 @@ class JobDescriptionLengthAnalyzer:
         
         return {
             'total_jobs': total_jobs,
-            'jobs_with_descriptions': len(jobs_with_descriptions),
+            'jobs_with_descriptions': len(length_data),
             'jobs_without_descriptions': jobs_without_descriptions,
             'length_data': length_data,
             'categories': categories,
@@ -51,7 +51,7 @@ def test_mongodb_connection():
         print("\n📊 Collection Statistics:")
         print("-" * 30)
         
-        total_jobs = collection.count_documents({})
+        total_jobs = collection.estimated_document_count()
         print(f"Total jobs: {total_jobs:,}")
         
         jobs_with_descriptions = collection.count_documents({
@@ -79,7 +79,11 @@ class JDExtractionFlagUpdater:
             ]
         }
         
-        low_quality_jobs = list(self.collection.find(query))
+        # Only the fields the preview/update steps read; descriptions stay on the server
+        low_quality_jobs = list(self.collection.find(query, {
+            'title': 1, 'company': 1, 'job_link': 1, 'jd_extraction': 1,
+            'jd_word_count': 1, 'jd_char_count': 1
+        }))
         
         logger.info(f"Found {len(low_quality_jobs)} jobs with low quality descriptions")
         logger.info(f"Criteria: < {word_threshold} words OR < {char_threshold} characters")
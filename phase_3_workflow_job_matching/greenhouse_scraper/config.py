@@ -29,6 +29,13 @@ JINA_BASE_URL = "https://r.jina.ai/"
 RATE_LIMIT_DELAY = 0.5
 BATCH_SIZE = 10
 MAX_RETRIES = 4
+JINA_CONCURRENCY = BATCH_SIZE  # Max in-flight Jina AI requests
+JINA_RPS = 1 / RATE_LIMIT_DELAY  # Max Jina AI requests started per second
+JINA_MAX_RETRY_AFTER = 60  # Max seconds to honour a 429 Retry-After header
+JINA_MAX_RESPONSE_BYTES = 2 * 1024 * 1024  # Reader output beyond this is not a job posting
+MAX_FALLBACK_DESCRIPTION_CHARS = 32 * 1024  # Cap for fallback/full-page job_description (raw content is kept whole)
+RESULT_FLUSH_SIZE = 50  # Extraction results per MongoDB bulk write
+RESULT_FLUSH_INTERVAL = 2.0  # Max seconds a fetched result waits before being written
 TIMEOUT = 60
 
 # AgentQL / Playwright Configuration (for Listing Scraping)
@@ -39,11 +46,28 @@ if AGENTQL_API_KEY:
 GREENHOUSE_URL = "https://my.greenhouse.io"
 JOBS_URL = "https://my.greenhouse.io/jobs"
 MAX_SEE_MORE_CLICKS = 60
+# Tracker hosts aborted by the scraper and verifier (exact host or any subdomain)
+ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+    "hotjar.com",
+    "mixpanel.com",
+    "fullstory.com",
+    "intercom.io",
+    "facebook.net"
+)
+SELECTOR_PROBE_TIMEOUT = 5000  # ms per fallback-selector click; loads keep Playwright's 30s default
+MAX_PARALLEL_LOCATIONS = 1  # Locations scraped at once; raise only after checking concurrent searches don't interfere
 
 # MongoDB Configuration
 MONGODB_URI = os.getenv("MONGODB_URI")
 MONGODB_DATABASE = os.getenv("MONGODB_DATABASE", "Resume_study")
 MONGODB_COLLECTION = "Job_postings_greenhouse"
+MONGODB_MAX_POOL_SIZE = 10  # One client per process; reads and the batch writer share it
+MONGODB_MAX_IDLE_TIME_MS = 60000
 
 # Job Filter for description_extractor.py
 DEFAULT_JOB_FILTER = {
@@ -1,13 +1,21 @@
 import os
+import sys
+import argparse
 import asyncio
 import aiohttp
 import time
 import json
 import re
+import atexit
+import queue
+import logging.handlers
+from collections import Counter
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from typing import List, Dict, Optional, Tuple
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, DuplicateKeyError
+from bson import ObjectId
+from pymongo import AsyncMongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError
 from dotenv import load_dotenv
 import logging
 
@@ -15,6 +23,44 @@ class CriticalAPIError(Exception):
     """Custom exception for critical Jina AI API errors (e.g., invalid key, persistent rate limits)."""
     pass
 
+class RateLimiter:
+    """Async context manager that spaces out entries so no more than `rate` happen per second."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self.next_slot = 0.0
+    
+    async def __aenter__(self):
+        # The slot is claimed before sleeping, so concurrent callers never share one
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+    
+    def pause(self, delay: float):
+        """Hold back every caller for at least `delay` seconds from now (e.g. after a 429)."""
+        resume_at = asyncio.get_running_loop().time() + delay
+        self.next_slot = max(self.next_slot, resume_at)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return a Retry-After header as seconds to wait (delta-seconds or HTTP-date form), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+
 # Load environment variables
 load_dotenv()
 
@@ -22,24 +68,103 @@ load_dotenv()
 from pathlib import Path
 from config import (
     LOGS_DIR, JINAAI_API_KEY, MONGODB_URI, MONGODB_DATABASE, 
-    MONGODB_COLLECTION, JINA_BASE_URL, RATE_LIMIT_DELAY, 
-    BATCH_SIZE, MAX_RETRIES, TIMEOUT, DEFAULT_JOB_FILTER
+    MONGODB_COLLECTION, JINA_BASE_URL, 
+    BATCH_SIZE, MAX_RETRIES, TIMEOUT, DEFAULT_JOB_FILTER,
+    JINA_CONCURRENCY, JINA_RPS, JINA_MAX_RETRY_AFTER, JINA_MAX_RESPONSE_BYTES, MAX_FALLBACK_DESCRIPTION_CHARS,
+    RESULT_FLUSH_SIZE, RESULT_FLUSH_INTERVAL, MONGODB_MAX_POOL_SIZE, MONGODB_MAX_IDLE_TIME_MS
 )
 
 # Create logs directory if it doesn't exist
 logs_dir = Path(LOGS_DIR)
 logs_dir.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(logs_dir / 'description_extractor_optimized.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# Records are queued by the calling coroutine and written to the file/console by a
+# background listener thread, so log I/O never blocks the event loop
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler(logs_dir / 'description_extractor_optimized.log', encoding='utf-8'),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Timestamp etc. added by log_handlers
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 logger = logging.getLogger(__name__)
 
+# Accepted job URL schemes (str.startswith takes the tuple in a single C call)
+URL_PREFIXES = ('http://', 'https://')
+
+# Footer/form markers; content after the earliest one is ignored for non-job validation
+VALIDATION_TRUNCATION_MARKERS = (
+    "voluntary self-identification",
+    "create a job alert",
+    "candidate privacy notice"
+)
+
+# Phrases that identify a form/survey page rather than a job description
+NON_JOB_PATTERNS = (
+    # 'equal employment opportunity policy', # Too broad, appears in footers
+    'government reporting purposes',
+    'self-identification survey',
+    # 'veterans readjustment assistance act', # Too broad
+    # 'federal contractor or subcontractor', # Too broad
+    'omb control number 1250-0005', # Specific to forms
+    'expires 04/30/2026', # Specific to forms
+    'form cc-305',
+    'page 1 of 1',
+    'completing this form is voluntary',
+    # 'vietnam era veterans readjustment', # Too broad
+    # 'voluntary self-identification', # Too broad
+    # 'disability status', # Too broad
+    # 'protected veteran', # Too broad (appears in EEO statements)
+    'pay transparency non-discrimination provision'
+)
+
+# Section headings that mark the start of a job description
+START_KEYWORDS = (
+    'about the role', 'what you\'ll do', 'responsibilities', 'requirements', 
+    'qualifications', 'what we\'re looking for', 'role overview', 'position overview',
+    'about this role', 'key responsibilities', 'job summary', 'role summary',
+    'position summary', 'we are looking for', 'the ideal candidate', 
+    'you will be responsible', 'about you and the role', 'about the position', 
+    'about this position', 'the role', 'this role', 'position details', 'job details',
+    'what you\'ll be doing', 'what you will do', 'key duties', 
+    'main responsibilities', 'primary responsibilities',
+    'who we are', 'about us', 'about the company', 'company overview',
+    'location:', 'why join', 'why work', 'why us',
+    'what you bring', 'what you\'ll bring', 'what you will bring',
+    'join our team', 'join the team', 'join us', 'exciting time to join', 
+    'what you can expect', 'your impact', 'unlock your potential'
+)
+
+# Lines that mark the end of a job description
+END_MARKERS = (
+    "create a job alert",
+    "apply for this job",
+    "voluntary self-identification",
+    "privacy policy",
+    "candidate privacy notice",
+    "submit application",
+    "apply now"
+)
+
+# Compiled once so each check is a single pass over the content (or line)
+VALIDATION_TRUNCATION_RE = re.compile('|'.join(map(re.escape, VALIDATION_TRUNCATION_MARKERS)))
+NON_JOB_RE = re.compile('|'.join(map(re.escape, NON_JOB_PATTERNS)))
+START_KEYWORD_RE = re.compile('|'.join(map(re.escape, START_KEYWORDS)))
+END_MARKER_RE = re.compile('|'.join(map(re.escape, END_MARKERS)))
+NON_ALPHANUMERIC_RE = re.compile(r'[^a-z0-9]')
+
+# Smart quotes and backticks become plain single quotes for keyword matching
+QUOTE_TRANSLATION = str.maketrans({'’': "'", '‘': "'", '`': "'"})
+
 # MongoDB job selection filter configuration
 MONGODB_JOB_FILTER = DEFAULT_JOB_FILTER.copy()
 env_job_filter = os.getenv("MONGODB_JOB_FILTER")
@@ -63,6 +188,8 @@ class JobDescriptionExtractor:
         mongo_client: MongoDB client instance.
         collection: MongoDB collection instance.
         session: aiohttp session for making API requests.
+        jina_semaphore: Caps the number of in-flight Jina AI requests.
+        jina_limiter: Caps the rate at which Jina AI requests are started.
     """
     
     def __init__(self, cycle: float = 0):
@@ -76,6 +203,8 @@ class JobDescriptionExtractor:
         self.mongo_client = None
         self.collection = None
         self.session = None
+        self.jina_semaphore = asyncio.Semaphore(JINA_CONCURRENCY)
+        self.jina_limiter = RateLimiter(JINA_RPS)
         self.processed_count = 0
         self.failed_count = 0
         self.start_time = None
@@ -88,20 +217,43 @@ class JobDescriptionExtractor:
     async def setup_mongodb_connection(self):
         """
         Establish connection to MongoDB using environment variables.
+        Safe to call more than once; an existing client is reused.
         
         Raises:
             Exception: If MONGODB_URI is missing or connection fails.
         """
+        if self.mongo_client is not None:
+            return True
+        
         if not MONGODB_URI:
             raise Exception("MONGODB_URI not found in environment variables")
         
         try:
-            self.mongo_client = MongoClient(MONGODB_URI)
-            # Test the connection
-            self.mongo_client.admin.command('ping')
+            # Async client, so database round-trips overlap with in-flight Jina AI requests
+            client = AsyncMongoClient(
+                MONGODB_URI,
+                maxPoolSize=MONGODB_MAX_POOL_SIZE,
+                maxIdleTimeMS=MONGODB_MAX_IDLE_TIME_MS
+            )
+            # Test the connection before keeping the client; close it if that fails or is
+            # cancelled, since nothing else holds a reference to it yet
+            try:
+                await client.admin.command('ping')
+            except BaseException:
+                await client.close()
+                raise
+            self.mongo_client = client
             db = self.mongo_client[MONGODB_DATABASE]
             self.collection = db[MONGODB_COLLECTION]
             
+            # Index the job filter fields so job selection and the pre-run count seek
+            # instead of scanning (no-op if it already exists). job_description is left
+            # out: indexing full description text would bloat the index.
+            await self.collection.create_index(
+                [('cycle', 1), ('link_type', 1), ('jd_extraction', 1)],
+                name='extract_selector'
+            )
+            
             logger.info(f"✅ Connected to MongoDB: {MONGODB_DATABASE}.{MONGODB_COLLECTION}")
             return True
         except ConnectionFailure as e:
@@ -114,15 +266,19 @@ class JobDescriptionExtractor:
         Initialize aiohttp ClientSession with optimized settings for Jina AI API.
         
         Configures:
-        - Connection pooling (limit=100)
+        - Connection pooling sized to JINA_CONCURRENCY with 75s keep-alive
         - Timeouts (aligned with Jina AI limits)
         - Default headers (API Key, User-Agent)
         """
+        # Every request goes to the Jina AI host and at most JINA_CONCURRENCY are in
+        # flight, so a larger pool would only hold idle sockets
         connector = aiohttp.TCPConnector(
-            limit=100,  # Total connection pool size
-            limit_per_host=30,  # Per-host connection limit
-            ttl_dns_cache=300,  # DNS cache TTL
+            limit=JINA_CONCURRENCY,  # Total connection pool size
+            limit_per_host=JINA_CONCURRENCY,  # Per-host connection limit
+            ttl_dns_cache=600,  # DNS cache TTL
             use_dns_cache=True,
+            keepalive_timeout=75,  # Keep idle Jina connections alive across batches
+            enable_cleanup_closed=True,  # Reclaim SSL transports the server closed uncleanly
         )
         
         # Timeout configuration aligned with Jina AI's processing time
@@ -166,13 +322,13 @@ class JobDescriptionExtractor:
             ]
         }
 
-    async def fetch_job_description(self, job_url: str, job_id: str, job_title: str = None) -> Tuple[str, str, str, bool, Optional[str]]:
+    async def fetch_job_description(self, job_url: str, job_id: ObjectId, job_title: str = None) -> Tuple[ObjectId, Optional[str], Optional[str], Optional[str], bool, Optional[str]]:
         """
         Fetch job description from a single URL using Jina AI Reader API
         
         Args:
             job_url: The job posting URL
-            job_id: MongoDB document ID for logging
+            job_id: MongoDB document ID, returned as-is for the update and used for logging
             job_title: Job title to prepend to clean extractions and use as start marker
             
         Returns:
@@ -186,62 +342,68 @@ class JobDescriptionExtractor:
         Raises:
             CriticalAPIError: If API calls fail after all retries
         """
-        if not job_url or not job_url.startswith('http'):
+        if not job_url or not job_url.startswith(URL_PREFIXES):
             error_msg = f"Invalid URL: {job_url}"
-            logger.warning(f"Invalid URL for job {job_id}: {job_url}")
+            logger.warning("Invalid URL for job %s: %s", job_id, job_url)
             return job_id, None, None, None, False, error_msg
             
         # Construct Jina AI Reader URL
         jina_url = f"{JINA_BASE_URL}{job_url}"
         
         for attempt in range(MAX_RETRIES):
+            retry_delay = 0
+            content = None
             try:
-                async with self.session.get(jina_url) as response:
+                # Excess tasks queue here instead of hitting 429 and burning retries
+                async with self.jina_semaphore, self.jina_limiter, self.session.get(jina_url) as response:
                     if response.status == 200:
-                        content = await response.text()
-                        
-                        # Parse the response to extract job description
-                        description, extraction_method = self.extract_description_from_content(content, job_title)
-                        
-                        if description:
-                            if extraction_method == "clean":
-                                logger.info(f"✅ Successfully extracted clean job description for job {job_id}")
-                            elif extraction_method == "fallback":
-                                logger.info(f"⚠️ Clean extraction fallback for job {job_id}")
-                            else:
-                                logger.info(f"⚠️ Using full Jina AI content for job {job_id} (extraction failed)")
-                            
-                            return job_id, description, extraction_method, content, True, None
-                        else:
-                            logger.warning(f"⚠️ No description found for job {job_id}")
-                            return job_id, None, None, content, True, None
+                        content = await self.read_response_text(response, job_id)
                     elif response.status == 429:
                         # Rate limited - wait longer
                         if attempt == MAX_RETRIES - 1: # Last attempt failed due to rate limit
-                            logger.critical(f"❌ Persistent rate limiting (429) for job {job_id}. Max retries exceeded. Stopping extraction.")
+                            logger.critical("❌ Persistent rate limiting (429) for job %s. Max retries exceeded. Stopping extraction.", job_id)
                             raise CriticalAPIError(f"Persistent rate limiting (429) after {MAX_RETRIES} attempts for URL: {job_url}")
                         
-                        wait_time = (2 ** attempt) * 2  # Exponential backoff
-                        logger.warning(f"Rate limited for job {job_id}, waiting {wait_time}s...")
-                        await asyncio.sleep(wait_time)
+                        # Prefer the server's Retry-After (capped, it is untrusted input);
+                        # exponential backoff only when it is absent
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        wait_time = min(retry_after, JINA_MAX_RETRY_AFTER) if retry_after is not None else (2 ** attempt) * 2
+                        # Hold back the other tasks too, instead of letting them all run into 429s
+                        self.jina_limiter.pause(wait_time)
+                        logger.warning("Rate limited for job %s, waiting %ss...", job_id, wait_time)
+                        retry_delay = wait_time
                     elif response.status == 401:
                         # Unauthorized - API key issue
-                        logger.critical(f"❌ Jina AI API Unauthorized (401) for job {job_id}. Check API key. Stopping extraction.")
+                        logger.critical("❌ Jina AI API Unauthorized (401) for job %s. Check API key. Stopping extraction.", job_id)
                         raise CriticalAPIError(f"Jina AI API Unauthorized (401). Check JINAAI_API_KEY.")
                     else:
                         error_msg = f"HTTP {response.status} error for URL: {job_url}"
-                        logger.error(f"HTTP {response.status} for job {job_id}: {job_url}")
+                        logger.error("HTTP %s for job %s: %s", response.status, job_id, job_url)
                         if attempt == MAX_RETRIES - 1:
                             # Max retries exceeded for HTTP error - Log and return failure
-                            logger.error(f"❌ Persistent HTTP {response.status} for job {job_id}. Marking as failed.")
+                            logger.error("❌ Persistent HTTP %s for job %s. Marking as failed.", response.status, job_id)
                             return job_id, None, None, None, False, error_msg
-                        await asyncio.sleep(1)
+                        retry_delay = 1
+                
+                if content is not None:
+                    # Parsed after leaving the block, so parsing doesn't hold a concurrency slot or the connection
+                    description, extraction_method = await self.parse_content(content, job_title)
+                    
+                    if description:
+                        # Per-method counts are logged once per bulk write in update_job_descriptions
+                        return job_id, description, extraction_method, content, True, None
+                    else:
+                        logger.warning("⚠️ No description found for job %s", job_id)
+                        return job_id, None, None, content, True, None
+                
+                # Back off after leaving the block, so the wait doesn't hold a concurrency slot
+                await asyncio.sleep(retry_delay)
                         
             except asyncio.TimeoutError:
                 error_msg = f"Timeout after {MAX_RETRIES} attempts for URL: {job_url}"
-                logger.warning(f"Timeout for job {job_id} (attempt {attempt + 1})")
+                logger.warning("Timeout for job %s (attempt %s)", job_id, attempt + 1)
                 if attempt == MAX_RETRIES - 1:
-                   logger.error(f"❌ Persistent Timeout for job {job_id}. Marking as failed.")
+                   logger.error("❌ Persistent Timeout for job %s. Marking as failed.", job_id)
                    return job_id, None, None, None, False, error_msg # Return failure instead of raising CriticalAPIError
                 await asyncio.sleep(2 ** attempt)
                 
@@ -249,16 +411,49 @@ class JobDescriptionExtractor:
                 raise
             except Exception as e:
                 error_msg = f"Exception after {MAX_RETRIES} attempts: {str(e)} for URL: {job_url}"
-                logger.error(f"Error fetching job {job_id}: {e}")
+                logger.error("Error fetching job %s: %s", job_id, e)
                 if attempt == MAX_RETRIES - 1:
-                    logger.error(f"❌ Persistent Error ({type(e).__name__}) for job {job_id}. Marking as failed.")
+                    logger.error("❌ Persistent Error (%s) for job %s. Marking as failed.", type(e).__name__, job_id)
                     return job_id, None, None, None, False, error_msg # Return failure instead of raising CriticalAPIError
                 await asyncio.sleep(1)
         
         # This point should not be reached if handled properly above, but as a safeguard:
         return job_id, None, None, None, False, f"Max retries ({MAX_RETRIES}) exceeded for URL: {job_url}"
 
-    def extract_description_from_content(self, content: str, job_title: str = None) -> tuple[Optional[str], str]:
+    @staticmethod
+    async def read_response_text(response: aiohttp.ClientResponse, job_id: ObjectId) -> str:
+        """
+        Read a Jina AI response body in chunks, stopping at JINA_MAX_RESPONSE_BYTES
+        so a runaway page cannot balloon memory.
+        
+        Args:
+            response: The aiohttp response to read
+            job_id: MongoDB document ID for logging
+            
+        Returns:
+            The (possibly truncated) body decoded as UTF-8
+        """
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) >= JINA_MAX_RESPONSE_BYTES:
+                logger.warning("Response for job %s exceeds %s bytes, truncating", job_id, JINA_MAX_RESPONSE_BYTES)
+                del body[JINA_MAX_RESPONSE_BYTES:]
+                break
+        # Jina AI Reader always returns UTF-8; 'replace' covers a cut multi-byte character
+        return body.decode('utf-8', errors='replace')
+
+    async def parse_content(self, content: str, job_title: str = None) -> Tuple[Optional[str], str]:
+        """
+        Run extract_description_from_content off the event loop.
+        
+        Parsing is a linear scan that takes milliseconds, so a worker thread is enough to
+        keep the loop responsive without pickling content to another process.
+        """
+        return await asyncio.to_thread(self.extract_description_from_content, content, job_title)
+
+    @staticmethod
+    def extract_description_from_content(content: str, job_title: str = None) -> tuple[Optional[str], str]:
         """
         Extract job description from Jina AI response content with robust state machine logic.
         
@@ -281,63 +476,26 @@ class JobDescriptionExtractor:
             # Cut off content at known footer/form markers to prevent their contents (like EEO statements) 
             # from triggering the non-job block.
             validation_content = content_lower
-            validation_truncation_markers = [
-                "voluntary self-identification",
-                "create a job alert",
-                "candidate privacy notice"
-            ]
-            
-            for marker in validation_truncation_markers:
-                idx = validation_content.find(marker)
-                if idx != -1:
-                    # Keep only the part before the marker
-                    validation_content = validation_content[:idx]
-
-            non_job_patterns = [
-                # 'equal employment opportunity policy', # Too broad, appears in footers
-                'government reporting purposes',
-                'self-identification survey',
-                # 'veterans readjustment assistance act', # Too broad
-                # 'federal contractor or subcontractor', # Too broad
-                'omb control number 1250-0005', # Specific to forms
-                'expires 04/30/2026', # Specific to forms
-                'form cc-305',
-                'page 1 of 1',
-                'completing this form is voluntary',
-                # 'vietnam era veterans readjustment', # Too broad
-                # 'voluntary self-identification', # Too broad
-                # 'disability status', # Too broad
-                # 'protected veteran', # Too broad (appears in EEO statements)
-                'pay transparency non-discrimination provision'
-            ]
+            truncation_match = VALIDATION_TRUNCATION_RE.search(validation_content)
+            if truncation_match:
+                # Keep only the part before the earliest marker
+                validation_content = validation_content[:truncation_match.start()]
             
             # If content contains non-job patterns significantly, marker as such
             # Only block if we are SURE it's a form/survey and NOT a job description.
             # EEO statements are common in JDs, so specific form identifiers (like OMB numbers) are safer.
-            if any(pattern in validation_content for pattern in non_job_patterns):
+            if NON_JOB_RE.search(validation_content):
                 logger.warning("Content identified as a form/survey/redirect (blocked)")
                 return None, "full_page_content"  # This ensures jd_extraction=False
 
             lines = content.split('\n')
+            # Lowercased, quote-normalised copy of every line, built from the single
+            # content.lower() above; lower() never adds or removes newlines, so the
+            # two lists stay index-aligned
+            lines_lower = content_lower.translate(QUOTE_TRANSLATION).split('\n')
             
             # --- Markers Setup ---
-            
-            # Start Markers
-            start_keywords = [
-                'about the role', 'what you\'ll do', 'responsibilities', 'requirements', 
-                'qualifications', 'what we\'re looking for', 'role overview', 'position overview',
-                'about this role', 'key responsibilities', 'job summary', 'role summary',
-                'position summary', 'we are looking for', 'the ideal candidate', 
-                'you will be responsible', 'about you and the role', 'about the position', 
-                'about this position', 'the role', 'this role', 'position details', 'job details',
-                'what you\'ll be doing', 'what you will do', 'key duties', 
-                'main responsibilities', 'primary responsibilities',
-                'who we are', 'about us', 'about the company', 'company overview',
-                'location:', 'why join', 'why work', 'why us',
-                'what you bring', 'what you\'ll bring', 'what you will bring',
-                'join our team', 'join the team', 'join us', 'exciting time to join', 
-                'what you can expect', 'your impact', 'unlock your potential'
-            ]
+            # Section keywords and end markers are matched with START_KEYWORD_RE / END_MARKER_RE
             
             # Start lines that might begin with "At [Company]" or "Why [Company]"
             # We handle these by checking starts_with in the loop or adding general patterns here.
@@ -348,17 +506,6 @@ class JobDescriptionExtractor:
             # "Apply" is often a button/link text that appears right before the description in some layouts
             exact_start_markers = ["apply"]
             
-            # End Markers
-            end_markers = [
-                "create a job alert",
-                "apply for this job",
-                "voluntary self-identification",
-                "privacy policy",
-                "candidate privacy notice",
-                "submit application",
-                "apply now"
-            ]
-            
             # --- State Machine ---
             # States: SEARCHING -> EXTRACTING -> STOPPED
             
@@ -368,7 +515,7 @@ class JobDescriptionExtractor:
             
             # Cleaning function for fuzzy matching
             def simplify_line(line):
-                return re.sub(r'[^a-z0-9]', '', line.lower())
+                return NON_ALPHANUMERIC_RE.sub('', line.lower())
             
             simplified_title = simplify_line(job_title) if job_title else None
             
@@ -383,25 +530,16 @@ class JobDescriptionExtractor:
                         description_lines.append(line)
                     continue
                 
-                # Normalize smart quotes and backticks to standard single quotes for keyword matching
-                line_lower = line_stripped.lower().replace('’', "'").replace('‘', "'").replace('`', "'")
+                # Smart quotes and backticks are already normalized to standard single quotes
+                line_lower = lines_lower[i].strip()
                 
                 # CHECK FOR END MARKERS (Priority Check to stop early)
                 # We check this in both SEARCHING and EXTRACTING states
                 # If we find an end marker in SEARCHING, it might mean we missed the start 
                 # or the intro was very short.
-                is_end = False
-                for marker in end_markers:
-                    if marker in line_lower:
-                        # Special check: "Apply" is both a start and part of "Apply for this job"
-                        # If the line is EXACTLY "Apply", treat as start (or ignored if extracting)
-                        # If "Apply for this job", treat as END.
-                        if line_lower == "apply" and "apply" in exact_start_markers:
-                            # It's a start marker, not an end marker here
-                            break 
-                        
-                        is_end = True
-                        break
+                # "Apply" alone is a start marker; "Apply for this job" / "Apply now" are end markers,
+                # and no end marker matches a bare "apply" line
+                is_end = END_MARKER_RE.search(line_lower) is not None
                 
                 if is_end:
                     if state == "EXTRACTING":
@@ -424,7 +562,7 @@ class JobDescriptionExtractor:
                     
                     # 1. Check Job Title (Fuzzy)
                     if simplified_title:
-                        sim_line = simplify_line(line_stripped)
+                        sim_line = NON_ALPHANUMERIC_RE.sub('', line_lower)
                         if simplified_title in sim_line and len(sim_line) < len(simplified_title) + 20:
                              # It's likely the title header
                             found_start = True
@@ -436,7 +574,7 @@ class JobDescriptionExtractor:
                             
                     # 3. Check Section Keywords
                     if not found_start:
-                         if any(keyword in line_lower for keyword in start_keywords):
+                         if START_KEYWORD_RE.search(line_lower):
                              # Ensure it's likely a header (length check or starts with #)
                              if len(line_stripped) < 100 or line_stripped.startswith('#'):
                                  found_start = True
@@ -501,60 +639,62 @@ class JobDescriptionExtractor:
                 fallback_lines = lines[:end_index]
                 fallback_text = '\n'.join(fallback_lines).strip()
                 if len(fallback_text) > 100:
-                    return fallback_text, "fallback"
+                    return fallback_text[:MAX_FALLBACK_DESCRIPTION_CHARS], "fallback"
 
             # If cleaned text is too short or logic failed completely
             logger.warning("Job description extraction failed to find markers, using full content")
-            return content.strip(), "full_page_content"
+            # The whole page is still stored as jina_raw_content; job_description only needs a bounded copy
+            return content.strip()[:MAX_FALLBACK_DESCRIPTION_CHARS], "full_page_content"
                 
         except Exception as e:
             logger.error(f"Error processing content: {e}")
-            return content.strip() if content else None, "full_page_content"
+            return content.strip()[:MAX_FALLBACK_DESCRIPTION_CHARS] if content else None, "full_page_content"
 
-    async def process_batch(self, jobs: List[Dict]) -> List[Tuple[str, Optional[str], str, str, bool, Optional[str]]]:
+    async def process_batch(self, jobs: List[Tuple[ObjectId, str, str]]) -> List[Tuple[ObjectId, Optional[str], str, str, bool, Optional[str]]]:
         """
         Process a batch of jobs concurrently
         
         Args:
-            jobs: List of job documents from MongoDB
+            jobs: List of (job_id, job_url, job_title) tuples
             
         Returns:
             List of (job_id, description, extraction_method, raw_content, api_success, error_message) tuples
         """
-        tasks = []
+        async def fetch_or_error(job_url: str, job_id: ObjectId, job_title: str):
+            # Only CriticalAPIError escapes, so it alone cancels the rest of the batch
+            try:
+                return await self.fetch_job_description(job_url, job_id, job_title)
+            except CriticalAPIError:
+                raise
+            except Exception as e:
+                return e
         
-        for job in jobs:
-            job_id = str(job['_id'])
-            job_url = job.get('job_link', '')
-            job_title = job.get('title', '')
-            
-            if job_url:
-                task = self.fetch_job_description(job_url, job_id, job_title)
-                tasks.append(task)
-                
-                # Add small delay to respect rate limits
-                await asyncio.sleep(RATE_LIMIT_DELAY)
+        tasks = []
         
-        # Execute all tasks concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for job_id, job_url, job_title in jobs:
+                    if job_url:
+                        # Pacing is left to jina_semaphore and jina_limiter, so tasks start at once
+                        tasks.append(tg.create_task(fetch_or_error(job_url, job_id, job_title)))
+        except* CriticalAPIError as eg:
+            # In-flight requests have been cancelled; surface the error as before
+            raise eg.exceptions[0] from None
         
-        # Check for CriticalAPIErrors first
-        for result in results:
-            if isinstance(result, CriticalAPIError):
-                raise result
+        results = [task.result() for task in tasks]
         
         # Filter out other exceptions and return valid results
         valid_results = []
         for result in results:
             if isinstance(result, Exception):
-                logger.error(f"Task failed with exception: {result}")
+                logger.error("Task failed with exception: %s", result)
                 self.failed_count += 1
             elif isinstance(result, tuple) and len(result) == 6:
                 valid_results.append(result)
         
         return valid_results
 
-    async def update_job_descriptions(self, results: List[Tuple[str, Optional[str], str, str, bool, Optional[str]]]):
+    async def update_job_descriptions(self, results: List[Tuple[ObjectId, Optional[str], str, str, bool, Optional[str]]]):
         """
         Update MongoDB with job descriptions. 
         Note: ONLY updates successful extractions. Failed extractions stop the script before this point.
@@ -565,53 +705,120 @@ class JobDescriptionExtractor:
         if not results:
             return
             
-        from bson import ObjectId
-        
-        # Update jobs individually to avoid bulk write issues
+        # Collect the updates and send them in one unordered bulk write
+        operations = []
+        operation_job_ids = []
+        method_counts = Counter()
         for job_id, description, extraction_method, raw_content, api_success, error_message in results:
-            try:
-                if api_success:
-                    # Determine success flag based on method
-                    # User requested that fallback/failures be marked as False
-                    jd_extraction_success = (extraction_method == "clean")
-                    
-                    # Update MongoDB with description, extraction method, and raw content
-                    update_data = {
-                        'job_description': description, # The "best" description we have
-                        'jd_extraction': jd_extraction_success, 
-                        'jd_extraction_method': extraction_method, # "clean", "fallback", "full_page_content"
-                        'jina_raw_content': raw_content, # NEW: Full raw content for audit
-                        'api_error': None  # Clear any previous error
-                    }
-                    
-                    result = self.collection.update_one(
-                        {'_id': ObjectId(job_id)},
-                        {'$set': update_data}
-                    )
-                    
-                    if result.modified_count > 0:
-                        self.processed_count += 1
-                        logger.info(f"✅ Updated job {job_id} ({extraction_method})")
-                    else:
-                        logger.warning(f"⚠️ No changes made to job {job_id}")
-                        
-                else:
-                    if not api_success:
-                         logger.warning(f"⚠️ Skipping update for job {job_id} due to API failure")
-                    
-            except Exception as e:
-                logger.error(f"Error updating job {job_id}: {e}")
-                self.failed_count += 1
+            if not api_success:
+                logger.warning("⚠️ Skipping update for job %s due to API failure", job_id)
+                method_counts['api_failed'] += 1
+                continue
+            
+            method_counts[extraction_method] += 1
+            
+            # Determine success flag based on method
+            # User requested that fallback/failures be marked as False
+            jd_extraction_success = (extraction_method == "clean")
+            
+            # Update MongoDB with description, extraction method, and raw content
+            update_data = {
+                'job_description': description, # The "best" description we have
+                'jd_extraction': jd_extraction_success, 
+                'jd_extraction_method': extraction_method, # "clean", "fallback", "full_page_content"
+                'jina_raw_content': raw_content, # NEW: Full raw content for audit
+                'api_error': None  # Clear any previous error
+            }
+            
+            operations.append(UpdateOne({'_id': job_id}, {'$set': update_data}))
+            operation_job_ids.append(job_id)
+        
+        if not operations:
+            return
+        
+        write_errors = []
+        try:
+            result = await self.collection.bulk_write(operations, ordered=False)
+            modified_count = result.modified_count
+        except BulkWriteError as e:
+            # Unordered: every other update was still applied
+            write_errors = e.details.get('writeErrors', [])
+            modified_count = e.details.get('nModified', 0)
+            for error in write_errors:
+                logger.error("Error updating job %s: %s", operation_job_ids[error['index']], error.get('errmsg'))
+        except Exception as e:
+            logger.error(f"Error updating batch of {len(operations)} jobs: {e}")
+            self.failed_count += len(operations)
+            return
+        
+        self.processed_count += modified_count
+        self.failed_count += len(write_errors)
+        unchanged_count = len(operations) - modified_count - len(write_errors)
+        
+        logger.info(
+            "✅ Updated %d jobs in one bulk write (clean=%d, fallback=%d, full_page_content=%d, api_failed=%d)",
+            modified_count,
+            method_counts['clean'],
+            method_counts['fallback'],
+            method_counts['full_page_content'],
+            method_counts['api_failed']
+        )
+        if unchanged_count > 0:
+            logger.warning(f"⚠️ No changes made to {unchanged_count} jobs")
 
-    async def get_jobs_without_descriptions(self, limit: Optional[int] = None) -> List[Dict]:
+    async def write_result_batches(self, results_queue: asyncio.Queue):
         """
-        Get jobs from MongoDB that don't have descriptions yet
+        Consume fetched batches from the queue and write them to MongoDB.
+        
+        Results are buffered across batches and flushed once RESULT_FLUSH_SIZE
+        have accumulated or RESULT_FLUSH_INTERVAL seconds have passed since the
+        last write.
         
         Args:
-            limit: Maximum number of jobs to process (None for all)
+            results_queue: Queue of process_batch results; None marks the end of the run
+        """
+        pending = []
+        last_flush = time.monotonic()
+        
+        while True:
+            try:
+                results = await asyncio.wait_for(results_queue.get(), timeout=RESULT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                results = []  # Nothing new; fall through to the time-based flush check
             
+            if results is None:
+                break
+            
+            pending.extend(results)
+            if len(pending) >= RESULT_FLUSH_SIZE or (pending and time.monotonic() - last_flush >= RESULT_FLUSH_INTERVAL):
+                await self.flush_results(pending)
+                pending = []
+                last_flush = time.monotonic()
+        
+        if pending:
+            await self.flush_results(pending)
+
+    async def flush_results(self, results: List[Tuple[ObjectId, Optional[str], str, str, bool, Optional[str]]]):
+        """
+        Write buffered results to MongoDB and log overall progress.
+        
+        Args:
+            results: List of (job_id, description, extraction_method, raw_content, api_success, error_message) tuples
+        """
+        # Update MongoDB
+        await self.update_job_descriptions(results)
+        
+        # Progress update
+        elapsed = time.time() - self.start_time
+        rate = (self.processed_count + self.failed_count) / elapsed if elapsed > 0 else 0
+        logger.info(f"Progress: {self.processed_count} processed, {self.failed_count} failed, {rate:.2f} jobs/sec")
+
+    def build_missing_description_query(self) -> Dict:
+        """
+        Build the MongoDB query for jobs that don't have descriptions yet.
+        
         Returns:
-            List of job documents
+            Dict: The combined MongoDB query.
         """
         # Using the same logic as before, but potentially we could use this to re-process 
         # jobs that have 'full_page_content' if we wanted to improve them. 
@@ -626,18 +833,61 @@ class JobDescriptionExtractor:
             ]
         }
 
-        query = self.build_job_query(query)
+        return self.build_job_query(query)
+
+    async def get_jobs_without_descriptions(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get jobs from MongoDB that don't have descriptions yet
+        
+        Args:
+            limit: Maximum number of jobs to process (None for all)
+            
+        Returns:
+            List of job documents
+        """
+        query = self.build_missing_description_query()
         
         cursor = self.collection.find(query, {'_id': 1, 'job_link': 1, 'title': 1, 'company': 1})
         
         if limit:
-            jobs = list(cursor.limit(limit))
-        else:
-            jobs = list(cursor)
+            cursor = cursor.limit(limit)
+        jobs = await cursor.to_list()
         
         logger.info(f"Found {len(jobs)} jobs without descriptions")
         return jobs
 
+    async def iter_job_batches(self, limit: Optional[int] = None, batch_size: int = BATCH_SIZE):
+        """
+        Stream jobs without descriptions from MongoDB, one batch at a time.
+        
+        Only one batch is held in memory, and the cursor fetches the next
+        batch from the server while the previous one is being processed.
+        
+        Args:
+            limit: Maximum number of jobs to yield (None for all)
+            batch_size: Number of jobs per yielded batch
+            
+        Yields:
+            Lists of (job_id, job_url, job_title) tuples
+        """
+        cursor = self.collection.find(
+            self.build_missing_description_query(),
+            {'_id': 1, 'job_link': 1, 'title': 1}
+        ).batch_size(batch_size)
+        
+        if limit:
+            cursor = cursor.limit(limit)
+        
+        batch = []
+        async for job in cursor:
+            # Keep the ObjectId itself; it is only formatted as a string in log messages
+            batch.append((job['_id'], job.get('job_link', ''), job.get('title', '')))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     async def get_jobs_with_api_errors(self, limit: Optional[int] = None) -> List[Dict]:
         """
         Get jobs from MongoDB that have API errors for reference/retry
@@ -665,9 +915,8 @@ class JobDescriptionExtractor:
         }).sort('created_at', -1)  # Most recent first
         
         if limit:
-            jobs = list(cursor.limit(limit))
-        else:
-            jobs = list(cursor)
+            cursor = cursor.limit(limit)
+        jobs = await cursor.to_list()
         
         logger.info(f"Found {len(jobs)} jobs with API errors")
         return jobs
@@ -684,52 +933,59 @@ class JobDescriptionExtractor:
         
         try:
             # Setup connections
-            await self.setup_mongodb_connection()
-            await self.setup_http_session()
+            await asyncio.gather(self.setup_mongodb_connection(), self.setup_http_session())
             
-            # Get jobs without descriptions
-            all_jobs = await self.get_jobs_without_descriptions(limit)
+            # Count jobs without descriptions; the jobs themselves are streamed below
+            total_jobs = await self.collection.count_documents(self.build_missing_description_query())
+            if limit:
+                total_jobs = min(total_jobs, limit)
             
-            if not all_jobs:
+            if not total_jobs:
                 logger.info("No jobs found that need descriptions")
                 return
             
-            logger.info(f"Starting extraction for {len(all_jobs)} jobs...")
+            logger.info(f"Starting extraction for {total_jobs} jobs...")
             
-            # Process jobs in batches
-            for i in range(0, len(all_jobs), batch_size):
-                batch = all_jobs[i:i + batch_size]
-                batch_num = (i // batch_size) + 1
-                total_batches = (len(all_jobs) + batch_size - 1) // batch_size
-                
-                logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} jobs)")
-                
-                # Process batch
-                try:
-                    results = await self.process_batch(batch)
-                except CriticalAPIError as e:
-                    logger.critical(f"Critical API error encountered: {e}. Stopping extraction.")
-                    # Re-raise to ensure main function catches it and exits cleanly
-                    raise 
-                
-                # Update MongoDB
-                await self.update_job_descriptions(results)
-                
-                # Progress update
-                elapsed = time.time() - self.start_time
-                rate = (self.processed_count + self.failed_count) / elapsed if elapsed > 0 else 0
-                logger.info(f"Progress: {self.processed_count} processed, {self.failed_count} failed, {rate:.2f} jobs/sec")
-                
-                # Small delay between batches (Removed as per user request for speed)
-                # if i + batch_size < len(all_jobs):
-                #     await asyncio.sleep(RATE_LIMIT_DELAY)
+            total_batches = (total_jobs + batch_size - 1) // batch_size
             
-                # Small delay between batches to prevent sustained rate limiting
-            if i + batch_size < len(all_jobs):
-                logger.info(f"Sleeping 2s between batches...")
-                await asyncio.sleep(2)
-        
-        # Final summary
+            # Fetched batches are handed to a writer task so MongoDB writes overlap with
+            # the Jina AI requests of the following batches. Both run in one TaskGroup, so
+            # a failed writer cancels the fetch loop instead of leaving it blocked on a full queue
+            results_queue = asyncio.Queue(maxsize=max(1, RESULT_FLUSH_SIZE // batch_size))
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    writer = tg.create_task(self.write_result_batches(results_queue))
+                    
+                    try:
+                        # Process jobs in batches
+                        batch_num = 0
+                        async for batch in self.iter_job_batches(limit, batch_size):
+                            batch_num += 1
+                            
+                            logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} jobs)")
+                            
+                            # Process batch
+                            try:
+                                results = await self.process_batch(batch)
+                            except CriticalAPIError as e:
+                                logger.critical(f"Critical API error encountered: {e}. Stopping extraction.")
+                                # Re-raise to ensure main function catches it and exits cleanly
+                                raise 
+                            
+                            await results_queue.put(results)
+                    finally:
+                        # Let the writer flush batches that were already fetched, even on a critical
+                        # error; skipped if the writer has failed, as nothing would drain the queue
+                        if not writer.done():
+                            await results_queue.put(None)
+                            await writer
+            except* CriticalAPIError as eg:
+                raise eg.exceptions[0] from None
+            except* Exception as eg:
+                # A failed writer; surface its own error rather than the group wrapper
+                raise eg.exceptions[0] from None
+            
+            # Final summary
             total_time = time.time() - self.start_time
             logger.info(f"✅ Extraction completed!")
             logger.info(f"📊 Total processed: {self.processed_count}")
@@ -744,48 +1000,81 @@ class JobDescriptionExtractor:
             if self.session:
                 await self.session.close()
 
+def parse_args():
+    """Parse command-line options; anything omitted is prompted for when interactive."""
+    parser = argparse.ArgumentParser(description="Extract job descriptions with the Jina AI Reader API.")
+    parser.add_argument('--cycle', type=float, help="Cycle number of the jobs to process")
+    parser.add_argument('--limit', type=int, help="Number of jobs to process (default: all)")
+    parser.add_argument('--batch-size', type=int, help=f"Number of jobs to process concurrently (default: {BATCH_SIZE})")
+    parser.add_argument('--no-interactive', action='store_true', help="Never prompt; use defaults for omitted options")
+    parser.add_argument('--quiet', action='store_true', help="Skip the settings summary")
+    return parser.parse_args()
+
+async def prompt(message: str) -> str:
+    """Read a line from stdin in a worker thread so the event loop is not blocked."""
+    return (await asyncio.to_thread(input, message)).strip()
+
 async def main():
     """Main function"""
     if not JINAAI_API_KEY:
         logger.error("❌ JINAAI_API_KEY not found in environment variables")
         return
     
-    print("Job Description Extractor (Optimized)")
-    print("=" * 50)
+    args = parse_args()
+    interactive = not args.no_interactive and sys.stdin.isatty()
+    
+    if not args.quiet:
+        print(f"Job Description Extractor (Optimized)\n{'=' * 50}")
     
     # Get cycle input
     default_cycle = DEFAULT_JOB_FILTER.get('cycle', 0)
-    print(f"\nDefault Cycle Number: {default_cycle}")
-    cycle_input = input(f"Enter Cycle Number (default {default_cycle}): ").strip()
-    
-    try:
-        cycle = float(cycle_input) if cycle_input else default_cycle
-        # If it's effectively an integer, convert for cleanliness
-        if cycle.is_integer():
-             cycle = int(cycle)
-    except ValueError:
-        print(f"Invalid input. Using default cycle: {default_cycle}")
+    cycle = args.cycle
+    if cycle is None and interactive:
+        print(f"\nDefault Cycle Number: {default_cycle}")
+        cycle_input = await prompt(f"Enter Cycle Number (default {default_cycle}): ")
+        try:
+            cycle = float(cycle_input) if cycle_input else None
+        except ValueError:
+            print(f"Invalid input. Using default cycle: {default_cycle}")
+    if cycle is None:
         cycle = default_cycle
+    # If it's effectively an integer, convert for cleanliness
+    if isinstance(cycle, float) and cycle.is_integer():
+        cycle = int(cycle)
         
     print(f"Using Cycle Number: {cycle}")
     
     extractor = JobDescriptionExtractor(cycle=cycle)
+    mongo_setup = None
     
     try:
-        # Setup MongoDB connection first
-        await extractor.setup_mongodb_connection()
+        # Connect to MongoDB in the background while the remaining options are read
+        mongo_setup = asyncio.create_task(extractor.setup_mongodb_connection())
         
-        limit_input = input("Enter number of jobs to process (press Enter for all): ").strip()
-        limit = int(limit_input) if limit_input else None
+        limit = args.limit
+        if limit is None and interactive:
+            limit_input = await prompt("Enter number of jobs to process (press Enter for all): ")
+            limit = int(limit_input) if limit_input else None
         
-        batch_input = input(f"Enter batch size (default {BATCH_SIZE}): ").strip()
-        batch_size = int(batch_input) if batch_input else BATCH_SIZE
+        batch_size = args.batch_size
+        if batch_size is None and interactive:
+            batch_input = await prompt(f"Enter batch size (default {BATCH_SIZE}): ")
+            batch_size = int(batch_input) if batch_input else None
+        if batch_size is None:
+            batch_size = BATCH_SIZE
         
-        print(f"\nStarting extraction...")
-        print(f"Limit: {limit if limit else 'All jobs'}")
-        print(f"Batch size: {batch_size}")
-        print(f"Rate limit delay: {RATE_LIMIT_DELAY}s")
-        print("-" * 50)
+        await mongo_setup
+        
+        if not args.quiet:
+            # One write for the whole block so log lines cannot interleave with it
+            sys.stdout.write(
+                f"\nStarting extraction...\n"
+                f"Limit: {limit if limit else 'All jobs'}\n"
+                f"Batch size: {batch_size}\n"
+                f"Jina AI pacing: {JINA_RPS:g} requests/sec, {JINA_CONCURRENCY} in flight\n"
+                f"{'-' * 50}\n"
+            )
+            sys.stdout.flush()
         
         await extractor.run_extraction(limit=limit, batch_size=batch_size)
         
@@ -797,8 +1086,21 @@ async def main():
         logger.error(f"Extraction failed: {e}")
         raise
     finally:
+        # A bad prompt answer can raise before mongo_setup is awaited; settle the task
+        # first so the client isn't connected after it has been closed
+        if mongo_setup is not None:
+            if not mongo_setup.done():
+                mongo_setup.cancel()
+            await asyncio.gather(mongo_setup, return_exceptions=True)
         if extractor.mongo_client:
-            extractor.mongo_client.close()
+            await extractor.mongo_client.close()
 
 if __name__ == "__main__":
+    # uvloop is an optional, faster drop-in event loop (not available on Windows)
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
     asyncio.run(main())
@@ -1,15 +1,20 @@
 import os
 import time
+import asyncio
+import threading
 import json
 import csv
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlparse
 
 # Import Configuration FIRST (Sets up Env Vars and API Keys)
 try:
     from config import (
         GREENHOUSE_URL, JOBS_URL, CONTEXT_DIR, CONTEXT_FILE,
-        MAX_SEE_MORE_CLICKS, MONGODB_URI, MONGODB_DATABASE,
+        MAX_SEE_MORE_CLICKS, MAX_PARALLEL_LOCATIONS, ANALYTICS_HOSTS,
+        SELECTOR_PROBE_TIMEOUT,
+        MONGODB_URI, MONGODB_DATABASE, MONGODB_MAX_POOL_SIZE,
         MONGODB_COLLECTION, SCRAPED_DATA_DIR, DATA_DIR,
         DEFAULT_JOB_FILTER
     )
@@ -19,43 +24,176 @@ except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     from config import (
         GREENHOUSE_URL, JOBS_URL, CONTEXT_DIR, CONTEXT_FILE,
-        MAX_SEE_MORE_CLICKS, MONGODB_URI, MONGODB_DATABASE,
+        MAX_SEE_MORE_CLICKS, MAX_PARALLEL_LOCATIONS, ANALYTICS_HOSTS,
+        SELECTOR_PROBE_TIMEOUT,
+        MONGODB_URI, MONGODB_DATABASE, MONGODB_MAX_POOL_SIZE,
         MONGODB_COLLECTION, SCRAPED_DATA_DIR, DATA_DIR,
         DEFAULT_JOB_FILTER
     )
 
 import agentql
-from playwright.sync_api import sync_playwright
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, DuplicateKeyError
+from playwright.async_api import async_playwright
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure
+
+# Resource types the listing pages never need; stylesheets are kept because
+# AgentQL and the visibility checks rely on layout
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Subdomain suffixes of ANALYTICS_HOSTS, for a single str.endswith check
+ANALYTICS_HOST_SUFFIXES = tuple(f".{host}" for host in ANALYTICS_HOSTS)
+
+# User agent for contexts created with browser.new_context (the persistent profile uses Chrome's own)
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Job links hosted on Greenhouse boards; anything else is a 'dynamic' company page
+GREENHOUSE_LINK_PREFIXES = ('https://job-boards.greenhouse.io', 'https://boards.greenhouse.io')
+
+# Upserts per bulk_write, well under the 16MB command limit
+MONGODB_WRITE_CHUNK_SIZE = 1000
+
+# Shared MongoDB client; location scrapes save from worker threads
+shared_mongo_client = None
+shared_mongo_collection = None
+mongo_lock = threading.Lock()
+
+# Selector fallbacks, tried in order
+DATE_POSTED_SELECTORS = (
+    "text=Date posted",
+    "button:has-text('Date posted')",
+    "[class*='date-posted']",
+    "[data-testid*='date-posted']"
+)
+
+LOCATION_INPUT_SELECTORS = (
+    "input[placeholder*='location' i]",
+    "input[placeholder*='city' i]",
+    "input[placeholder*='where' i]",
+    "input[placeholder*='Location']",
+    "[class*='location'] input",
+    "[data-testid*='location'] input",
+    "input[type='text']:near(text=Location)",
+    "input[type='search']"
+)
+
+# Only the specific location inputs are cleared, never a generic text/search box
+CLEAR_LOCATION_INPUT_SELECTORS = LOCATION_INPUT_SELECTORS[:5]
+
+DROPDOWN_SELECTORS = (
+    "[class*='option']",
+    "[class*='dropdown']",
+    "[class*='suggestion']",
+    "[class*='autocomplete']",
+    "[role='option']"
+)
+
+FIRST_OPTION_SELECTORS = (
+    "[class*='option']:first-child",
+    "[class*='dropdown'] li:first-child",
+    "[role='option']:first-child"
+)
+
+SEARCH_BUTTON_SELECTORS = (
+    "button:has-text('Search')",
+    "input[type='submit']",
+    "[class*='search'] button",
+    "[data-testid*='search'] button"
+)
+
+# CSS-engine selectors for the "See more jobs" button, combined into one query
+SEE_MORE_CSS_SELECTORS = (
+    "button:has-text('See more jobs')",
+    "span:has-text('See more jobs')",
+    "[class*='see-more']",
+    "[class*='load-more']",
+    "[data-testid*='see-more']",
+    "[data-testid*='load-more']",
+    "button:has-text('Load more')",
+    "button:has-text('Show more')"
+)
+SEE_MORE_SELECTOR = ", ".join(SEE_MORE_CSS_SELECTORS)
+
+# Fallback for buttons the CSS list misses: one accessible-name match (same as
+# page.get_by_role) instead of a separate text= query per label
+SEE_MORE_ROLE_SELECTOR = "role=button[name=/see more|load more|show more/i]"
+
+# Upper bound (ms) for the event-driven waits that replaced fixed sleeps after clicks;
+# a timeout just means the UI didn't signal and the next step's auto-wait takes over
+UI_SETTLE_TIMEOUT = 3000
+NO_BUSY_ELEMENTS_SCRIPT = "() => !document.querySelector('[aria-busy=\"true\"]')"
+# "See more jobs" appends job cards, each with its own link
+MORE_LINKS_LOADED_SCRIPT = "(previous) => document.links.length > previous"
+
+# Clicks the first visible clear/reset control, trying labelled buttons before
+# class-name matches; returns what was clicked or null
+CLEAR_FILTERS_SCRIPT = """
+() => {
+    const labels = ['clear', 'reset', 'clear all'];
+    const isVisible = (el) => el.offsetParent !== null;
+    for (const el of document.querySelectorAll('button, a, span, [role="button"]')) {
+        const text = (el.innerText || '').trim().toLowerCase();
+        if (labels.includes(text) && isVisible(el)) {
+            el.click();
+            return text;
+        }
+    }
+    for (const el of document.querySelectorAll("[class*='clear'], [class*='reset']")) {
+        if (isVisible(el)) {
+            el.click();
+            return el.className;
+        }
+    }
+    return null;
+}
+"""
 
 def setup_mongodb_connection():
-    """Set up MongoDB connection"""
+    """Set up MongoDB connection (shared by every caller until it is closed)"""
+    global shared_mongo_client, shared_mongo_collection
+    
     if not MONGODB_URI:
         raise Exception("MONGODB_URI not found in environment variables")
     
-    try:
-        client = MongoClient(MONGODB_URI)
-        # Test the connection
-        client.admin.command('ping')
-        db = client[MONGODB_DATABASE]
-        collection = db[MONGODB_COLLECTION]
-        
-        # Create unique index on job_link to prevent duplicates
-        collection.create_index("job_link", unique=True, sparse=True)
-        
-        print(f"✅ Connected to MongoDB: {MONGODB_DATABASE}.{MONGODB_COLLECTION}")
-        return client, collection
-    except ConnectionFailure as e:
-        raise Exception(f"Failed to connect to MongoDB: {e}")
-    except Exception as e:
-        raise Exception(f"MongoDB setup error: {e}")
+    with mongo_lock:
+        if shared_mongo_collection is not None:
+            return shared_mongo_client, shared_mongo_collection
+        
+        try:
+            client = MongoClient(MONGODB_URI, maxPoolSize=MONGODB_MAX_POOL_SIZE)
+            # Test the connection
+            client.admin.command('ping')
+            db = client[MONGODB_DATABASE]
+            collection = db[MONGODB_COLLECTION]
+            
+            # Create unique index on job_link to prevent duplicates
+            collection.create_index("job_link", unique=True, sparse=True)
+            # Existing links are loaded per search location and cycle at the start of a run
+            collection.create_index([("search_location", 1), ("cycle", 1)])
+            # Status scripts count extraction outcomes with count_documents/leading $match
+            collection.create_index("jd_extraction", sparse=True)
+            
+            print(f"✅ Connected to MongoDB: {MONGODB_DATABASE}.{MONGODB_COLLECTION}")
+            shared_mongo_client, shared_mongo_collection = client, collection
+            return client, collection
+        except ConnectionFailure as e:
+            raise Exception(f"Failed to connect to MongoDB: {e}")
+        except Exception as e:
+            raise Exception(f"MongoDB setup error: {e}")
+
+def close_mongodb_connection():
+    """Close the shared MongoDB client so the next setup reconnects"""
+    global shared_mongo_client, shared_mongo_collection
+    
+    with mongo_lock:
+        if shared_mongo_client is not None:
+            shared_mongo_client.close()
+        shared_mongo_client, shared_mongo_collection = None, None
 
-def setup_browser_context(playwright, persistent=True):
+async def setup_browser_context(playwright, persistent=True):
     """Set up browser with persistent context for login state"""
-    if persistent and os.path.exists(CONTEXT_FILE):
+    if persistent and CONTEXT_FILE.exists():
         print("Loading existing browser context...")
-        context = playwright.chromium.launch_persistent_context(
+        context = await playwright.chromium.launch_persistent_context(
             user_data_dir=CONTEXT_DIR,
             channel="chrome",  # Use localized Chrome
             headless=False,
@@ -64,24 +202,44 @@ def setup_browser_context(playwright, persistent=True):
         return context, True  # Return context and is_persistent flag
     else:
         print("Creating new browser context...")
-        browser = playwright.chromium.launch(
+        browser = await playwright.chromium.launch(
             channel="chrome",  # Use localized Chrome
             headless=False,
             args=['--no-sandbox', '--disable-blink-features=AutomationControlled']
         )
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        context = await browser.new_context(user_agent=BROWSER_USER_AGENT)
         return context, False  # Return context and is_persistent flag
 
-def manual_login_flow(page):
+async def block_non_essential_requests(route):
+    """Playwright route handler that aborts images, media and fonts"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+def is_analytics_url(url):
+    """True when the URL's host is a tracker host (trackers keep 'networkidle' from settling)"""
+    hostname = urlparse(url).hostname or ""
+    return hostname in ANALYTICS_HOSTS or hostname.endswith(ANALYTICS_HOST_SUFFIXES)
+
+async def block_analytics_request(route):
+    """Playwright route handler that aborts analytics/tracker requests"""
+    await route.abort()
+
+async def enable_resource_blocking(context):
+    """Block non-essential resources for every page in the context"""
+    await context.route("**/*", block_non_essential_requests)
+    await context.route(is_analytics_url, block_analytics_request)
+    print("Blocking images, media, fonts and analytics for scraping")
+
+async def manual_login_flow(page):
     """Handle manual login process"""
     print("log in manually in the browser window...")
-    input("Press Enter after you've completed the login...")
+    await asyncio.to_thread(input, "Press Enter after you've completed the login...")
     
     # Verify we're logged in
     try:
-        page.wait_for_selector("text=Jobs", timeout=10000)
+        await page.wait_for_selector("text=Jobs", timeout=10000)
         print("Login successful!")
         return True
     except Exception as e:
@@ -90,34 +248,28 @@ def manual_login_flow(page):
 
 def save_context_info(context):
     """Save context information for future use"""
-    os.makedirs(CONTEXT_DIR, exist_ok=True)
     context_info = {
         "timestamp": time.time(),
-        "user_data_dir": CONTEXT_DIR
+        "user_data_dir": str(CONTEXT_DIR)
     }
-    with open(CONTEXT_FILE, 'w') as f:
-        json.dump(context_info, f)
+    CONTEXT_FILE.write_text(json.dumps(context_info))
     print(f"Context saved to {CONTEXT_FILE}")
 
-def set_date_posted_filter(page, days=30):
+async def set_date_posted_filter(page, days=30):
     """Set the Date posted filter to Within 30 days using multiple approaches"""
     print(f"Setting 'Date posted' filter to 'Within {days} days'...")
     
+    # Determine strict text: "day" for 1, "days" for others
+    day_text = "day" if days == 1 else "days"
+    filter_text = f"Within {days} {day_text}"
+    
     try:
         # First try using direct Playwright selectors as fallback
-        date_posted_selectors = [
-            "text=Date posted",
-            "button:has-text('Date posted')",
-            "[class*='date-posted']",
-            "[data-testid*='date-posted']"
-        ]
-        
         dropdown_clicked = False
-        for selector in date_posted_selectors:
+        for selector in DATE_POSTED_SELECTORS:
             try:
                 print(f"Trying to click 'Date posted' with selector: {selector}")
-                page.click(selector)
-                time.sleep(1)  # Wait for dropdown to open
+                await page.click(selector, timeout=SELECTOR_PROBE_TIMEOUT)
                 dropdown_clicked = True
                 print("✅ Successfully clicked 'Date posted' dropdown")
                 break
@@ -129,11 +281,13 @@ def set_date_posted_filter(page, days=30):
             print("❌ Could not click 'Date posted' dropdown with any selector")
             return False
         
-        # Now try to select "Within X days" option
-        # Determine strict text: "day" for 1, "days" for others
-        day_text = "day" if days == 1 else "days"
-        filter_text = f"Within {days} {day_text}"
+        # Wait for dropdown to open
+        try:
+            await page.wait_for_selector(f"text={filter_text}", state="visible", timeout=UI_SETTLE_TIMEOUT)
+        except:
+            pass
         
+        # Now try to select "Within X days" option
         within_days_selectors = [
             f"text={filter_text}",
             f"label:has-text('{filter_text}')",
@@ -145,8 +299,7 @@ def set_date_posted_filter(page, days=30):
         for selector in within_days_selectors:
             try:
                 print(f"Trying to select '{filter_text}' with selector: {selector}")
-                page.click(selector)
-                time.sleep(1)  # Wait for selection to apply
+                await page.click(selector, timeout=SELECTOR_PROBE_TIMEOUT)
                 option_selected = True
                 print(f"✅ Successfully selected '{filter_text}'")
                 break
@@ -155,6 +308,11 @@ def set_date_posted_filter(page, days=30):
                 continue
         
         if option_selected:
+            # Wait for selection to apply
+            try:
+                await page.wait_for_function(NO_BUSY_ELEMENTS_SCRIPT, timeout=UI_SETTLE_TIMEOUT)
+            except:
+                pass
             print(f"✅ Successfully set 'Date posted' filter to '{filter_text}'")
             return True
         else:
@@ -165,7 +323,7 @@ def set_date_posted_filter(page, days=30):
         print(f"Error setting date posted filter: {e}")
         return False
 
-def search_jobs_by_location(page, location="toronto"):
+async def search_jobs_by_location(page, location="toronto"):
     """Search for jobs in a specific location using AgentQL with fallback"""
     print(f"Searching for jobs in {location}...")
     
@@ -185,7 +343,7 @@ def search_jobs_by_location(page, location="toronto"):
                 """
                 
                 # Use query_elements for form interaction
-                response = page.query_elements(search_query)
+                response = await page.query_elements(search_query)
                 
                 if response and hasattr(response, 'Input'):
                     input_form = response.Input
@@ -194,34 +352,19 @@ def search_jobs_by_location(page, location="toronto"):
                     if hasattr(input_form, 'location_input'):
                         print(f"Typing '{location}' in location input...")
                         
-                        # Clear field and type slowly to trigger dropdown
-                        input_form.location_input.clear()
-                        time.sleep(0.5)
-                        
-                        # Type character by character to simulate human typing
-                        for char in location:
-                            input_form.location_input.type(char)
-                            time.sleep(0.1)
+                        # Fill replaces the field value in one step
+                        await input_form.location_input.fill(location)
                         
                         # Trigger input events to ensure dropdown appears
-                        input_form.location_input.evaluate("element => element.dispatchEvent(new Event('input', { bubbles: true }))")
-                        input_form.location_input.evaluate("element => element.dispatchEvent(new Event('keyup', { bubbles: true }))")
-                        time.sleep(2)
+                        await input_form.location_input.dispatch_event("input")
+                        await input_form.location_input.dispatch_event("keyup")
                         
                         # Wait for dropdown and click first option
                         print("Looking for dropdown options...")
-                        dropdown_selectors = [
-                            "[class*='option']",
-                            "[class*='dropdown']",
-                            "[class*='suggestion']",
-                            "[class*='autocomplete']",
-                            "[role='option']"
-                        ]
-                        
                         dropdown_found = False
-                        for selector in dropdown_selectors:
+                        for selector in DROPDOWN_SELECTORS:
                             try:
-                                page.wait_for_selector(selector, timeout=3000)
+                                await page.wait_for_selector(selector, timeout=3000)
                                 print(f"Found dropdown with selector: {selector}")
                                 dropdown_found = True
                                 break
@@ -230,19 +373,17 @@ def search_jobs_by_location(page, location="toronto"):
                         
                         # Click first dropdown option if found
                         if dropdown_found:
-                            first_option_selectors = [
-                                "[class*='option']:first-child",
-                                "[class*='dropdown'] li:first-child",
-                                "[role='option']:first-child"
-                            ]
-                            
-                            for option_selector in first_option_selectors:
+                            for option_selector in FIRST_OPTION_SELECTORS:
                                 try:
-                                    first_option = page.query_selector(option_selector)
-                                    if first_option and first_option.is_visible():
-                                        first_option.click()
+                                    first_option = await page.query_selector(option_selector)
+                                    if first_option and await first_option.is_visible():
+                                        await first_option.click()
                                         print("✅ Selected first dropdown option")
-                                        time.sleep(1)
+                                        # Wait for the dropdown to close
+                                        try:
+                                            await first_option.wait_for_element_state("hidden", timeout=UI_SETTLE_TIMEOUT)
+                                        except:
+                                            pass
                                         break
                                 except:
                                     continue
@@ -252,8 +393,8 @@ def search_jobs_by_location(page, location="toronto"):
                         # Click search button
                         if hasattr(input_form, 'search_btn'):
                             print("Clicking search button...")
-                            input_form.search_btn.click()
-                            page.wait_for_load_state('networkidle')
+                            await input_form.search_btn.click()
+                            await page.wait_for_load_state('networkidle')
                             print(f"✅ Successfully searched for jobs in {location}")
                             return True
                         else:
@@ -268,22 +409,11 @@ def search_jobs_by_location(page, location="toronto"):
         print("Trying fallback approach with direct selectors...")
         
         # Try to find location input using multiple selectors
-        location_input_selectors = [
-            "input[placeholder*='location' i]",
-            "input[placeholder*='city' i]", 
-            "input[placeholder*='where' i]",
-            "input[placeholder*='Location']",
-            "[class*='location'] input",
-            "[data-testid*='location'] input",
-            "input[type='text']:near(text=Location)",
-            "input[type='search']"
-        ]
-        
         location_input = None
-        for selector in location_input_selectors:
+        for selector in LOCATION_INPUT_SELECTORS:
             try:
-                location_input = page.query_selector(selector)
-                if location_input and location_input.is_visible():
+                location_input = await page.query_selector(selector)
+                if location_input and await location_input.is_visible():
                     print(f"Found location input with selector: {selector}")
                     break
             except:
@@ -295,33 +425,18 @@ def search_jobs_by_location(page, location="toronto"):
         
         # Fill in the location
         print(f"Typing '{location}' in location input...")
-        location_input.clear()
-        time.sleep(0.5)
-        
-        # Type character by character to simulate human typing
-        for char in location:
-            location_input.type(char)
-            time.sleep(0.1)
+        await location_input.fill(location)
         
         # Trigger input events to ensure dropdown appears
-        location_input.evaluate("element => element.dispatchEvent(new Event('input', { bubbles: true }))")
-        location_input.evaluate("element => element.dispatchEvent(new Event('keyup', { bubbles: true }))")
-        time.sleep(2)
+        await location_input.dispatch_event("input")
+        await location_input.dispatch_event("keyup")
         
         # Wait for dropdown and click first option
         print("Looking for dropdown options...")
-        dropdown_selectors = [
-            "[class*='option']",
-            "[class*='dropdown']",
-            "[class*='suggestion']",
-            "[class*='autocomplete']",
-            "[role='option']"
-        ]
-        
         dropdown_found = False
-        for selector in dropdown_selectors:
+        for selector in DROPDOWN_SELECTORS:
             try:
-                page.wait_for_selector(selector, timeout=3000)
+                await page.wait_for_selector(selector, timeout=3000)
                 print(f"Found dropdown with selector: {selector}")
                 dropdown_found = True
                 break
@@ -330,19 +445,17 @@ def search_jobs_by_location(page, location="toronto"):
         
         # Click first dropdown option if found
         if dropdown_found:
-            first_option_selectors = [
-                "[class*='option']:first-child",
-                "[class*='dropdown'] li:first-child",
-                "[role='option']:first-child"
-            ]
-            
-            for option_selector in first_option_selectors:
+            for option_selector in FIRST_OPTION_SELECTORS:
                 try:
-                    first_option = page.query_selector(option_selector)
-                    if first_option and first_option.is_visible():
-                        first_option.click()
+                    first_option = await page.query_selector(option_selector)
+                    if first_option and await first_option.is_visible():
+                        await first_option.click()
                         print("✅ Selected first dropdown option")
-                        time.sleep(1)
+                        # Wait for the dropdown to close
+                        try:
+                            await first_option.wait_for_element_state("hidden", timeout=UI_SETTLE_TIMEOUT)
+                        except:
+                            pass
                         break
                 except:
                     continue
@@ -350,20 +463,11 @@ def search_jobs_by_location(page, location="toronto"):
             print("⚠️ No dropdown found, continuing...")
         
         # Find and click search button
-        search_button_selectors = [
-            "button:has-text('Search')",
-            "input[type='submit']",
-            "[class*='search'] button",
-            "[data-testid*='search'] button"
-        ]
-        
         search_clicked = False
-        for selector in search_button_selectors:
+        for selector in SEARCH_BUTTON_SELECTORS:
             try:
                 print(f"Trying to click search button with selector: {selector}")
-                page.click(selector)
-                page.wait_for_load_state('networkidle')
-                print(f"✅ Successfully searched for jobs in {location}")
+                await page.click(selector, timeout=SELECTOR_PROBE_TIMEOUT)
                 search_clicked = True
                 break
             except Exception as e:
@@ -371,6 +475,12 @@ def search_jobs_by_location(page, location="toronto"):
                 continue
         
         if search_clicked:
+            # Outside the selector loop: a slow results load must not count as a failed selector
+            try:
+                await page.wait_for_load_state('networkidle')
+            except Exception as e:
+                print(f"⚠️ Search results still loading: {e}")
+            print(f"✅ Successfully searched for jobs in {location}")
             return True
         else:
             print("❌ Search button not found")
@@ -381,7 +491,7 @@ def search_jobs_by_location(page, location="toronto"):
         return False
 
 
-def extract_job_data(page):
+async def extract_job_data(page):
     """Extract job posting data from the current page using AgentQL"""
     print("Extracting job data...")
     
@@ -392,10 +502,10 @@ def extract_job_data(page):
     try:
         # Wait for job listings to load
         try:
-            page.wait_for_selector(".job-card, .job-listing, [class*='job']", timeout=10000)
+            await page.wait_for_selector(".job-card, .job-listing, [class*='job']", timeout=10000)
         except:
             # Fallback to text selector
-            page.wait_for_selector("text=View job", timeout=10000)
+            await page.wait_for_selector("text=View job", timeout=10000)
     
         # Query to get all job listings
         job_query = """
@@ -411,7 +521,7 @@ def extract_job_data(page):
         """
         
         # Execute the query
-        result = page.query_data(job_query)
+        result = await page.query_data(job_query)
         
         if result and 'jobs' in result:
             jobs = result['jobs']
@@ -434,24 +544,20 @@ def clean_job_title(title):
     title_length = len(title)
     if title_length % 2 == 0:  # Even length
         mid_point = title_length // 2
-        first_half = title[:mid_point]
-        second_half = title[mid_point:]
         
-        if first_half == second_half:
+        # Only slice when the halves can match; most titles differ at the first character
+        if title[0] == title[mid_point] and title[:mid_point] == title[mid_point:]:
             # Title is duplicated, return only the first half
-            return first_half
+            return title[:mid_point]
     
-    # Also check for word-level duplication
+    # Also check for word-level duplication (only an even word count can repeat exactly)
     words = title.split()
-    if len(words) >= 2:
-        mid_point = len(words) // 2
-        first_half = words[:mid_point]
-        second_half = words[mid_point:mid_point + len(first_half)]
-        
-        if first_half == second_half:
+    word_count = len(words)
+    if word_count >= 2 and word_count % 2 == 0:
+        mid_point = word_count // 2
+        if words[0] == words[mid_point] and words[:mid_point] == words[mid_point:]:
             # Title is duplicated at word level, return only the first half
-            cleaned_title = ' '.join(first_half)
-            return cleaned_title
+            return ' '.join(words[:mid_point])
     
     return title
 
@@ -460,27 +566,20 @@ def remove_duplicate_jobs(jobs):
     if not jobs:
         return jobs
     
-    seen_links = set()
-    unique_jobs = []
+    # Keyed by job_link (or normalised title + company when there is no link); the
+    # first occurrence wins and insertion order is preserved
+    unique_by_key = {}
     
     for job in jobs:
         # Clean the title to remove duplicates
-        original_title = job.get('title', '')
-        cleaned_title = clean_job_title(original_title)
-        if cleaned_title != original_title:
-            job['title'] = cleaned_title
-        
-        job_link = job.get('job_link', '')
-        if job_link and job_link not in seen_links:
-            seen_links.add(job_link)
-            unique_jobs.append(job)
-        elif not job_link:
-            # If no job_link, use title + company as unique identifier
-            identifier = f"{job.get('title', '')}_{job.get('company', '')}"
-            if identifier not in seen_links:
-                seen_links.add(identifier)
-                unique_jobs.append(job)
+        job['title'] = clean_job_title(job.get('title', ''))
+        key = job.get('job_link') or (
+            str(job['title']).strip().lower(),
+            str(job.get('company', '')).strip().lower()
+        )
+        unique_by_key.setdefault(key, job)
     
+    unique_jobs = list(unique_by_key.values())
     removed_count = len(jobs) - len(unique_jobs)
     if removed_count > 0:
         print(f"✅ Removed {removed_count} duplicate job postings")
@@ -506,10 +605,7 @@ def save_jobs_to_mongodb(jobs, collection, location=None, cycle=0):
         job_link = str(job.get('job_link', '')).strip()
         
         # Determine link_type based on job_link URL
-        if job_link.startswith('https://job-boards.greenhouse.io') or job_link.startswith('https://boards.greenhouse.io'):
-            link_type = 'greenhouse'
-        else:
-            link_type = 'dynamic'
+        link_type = 'greenhouse' if job_link.startswith(GREENHOUSE_LINK_PREFIXES) else 'dynamic'
         
         clean_job = {
             'title': str(job.get('title', '')).strip(),
@@ -529,43 +625,71 @@ def save_jobs_to_mongodb(jobs, collection, location=None, cycle=0):
         clean_job = {k: v for k, v in clean_job.items() if v}
         jobs_to_insert.append(clean_job)
     
-    # Insert jobs into MongoDB
+    # Upsert jobs into MongoDB in unordered bulk writes keyed on job_link. $setOnInsert
+    # only writes new jobs and leaves existing ones untouched, so duplicates are counted
+    # as matches instead of raising errors. Jobs without a link have no key and are skipped.
+    jobs_with_links = [job for job in jobs_to_insert if job.get('job_link')]
+    missing_link_count = len(jobs_to_insert) - len(jobs_with_links)
     inserted_count = 0
     duplicate_count = 0
     
-    for job in jobs_to_insert:
+    for start in range(0, len(jobs_with_links), MONGODB_WRITE_CHUNK_SIZE):
+        chunk = jobs_with_links[start:start + MONGODB_WRITE_CHUNK_SIZE]
+        operations = [
+            UpdateOne({'job_link': job['job_link']}, {'$setOnInsert': job}, upsert=True)
+            for job in chunk
+        ]
         try:
-            # Check if job_link already exists in MongoDB
-            existing_job = collection.find_one({'job_link': job.get('job_link')})
-            
-            if existing_job:
-                # Document already exists - skip it (don't overwrite)
-                duplicate_count += 1
-            else:
-                # Document doesn't exist - insert it
-                result = collection.insert_one(job)
-                if result.inserted_id:
-                    inserted_count += 1
-                
-        except DuplicateKeyError:
-            duplicate_count += 1
+            result = collection.bulk_write(operations, ordered=False)
+            inserted_count += result.upserted_count
+            duplicate_count += result.matched_count
+        except BulkWriteError as e:
+            inserted_count += e.details.get('nUpserted', 0)
+            duplicate_count += e.details.get('nMatched', 0)
+            for error in e.details.get('writeErrors', []):
+                if error.get('code') == 11000:
+                    # Another location inserted the same link between our match and upsert
+                    duplicate_count += 1
+                else:
+                    job = chunk[error['index']]
+                    print(f"Error inserting job {job.get('title', 'Unknown')}: {error.get('errmsg')}")
         except Exception as e:
-            print(f"Error inserting job {job.get('title', 'Unknown')}: {e}")
-            continue
+            print(f"Error inserting jobs: {e}")
     
+    if missing_link_count:
+        print(f"⚠️ Skipped {missing_link_count} jobs without a job link")
     print(f"✅ MongoDB: {inserted_count} jobs inserted, {duplicate_count} duplicates skipped")
     return inserted_count
 
+def format_csv_value(value):
+    """Flatten list values and strip whitespace for a CSV cell"""
+    if isinstance(value, list):
+        value = ', '.join(value)
+    return str(value).strip()
+
+def load_existing_job_links(collection, locations, cycle):
+    """Return the job links already stored for these locations in this cycle"""
+    # Streamed from a projected cursor: distinct() returns one reply capped at 16MB.
+    # Links from older cycles are still caught by the job_link upsert.
+    try:
+        cursor = collection.find(
+            {'search_location': {'$in': locations}, 'cycle': cycle, 'job_link': {'$exists': True}},
+            {'job_link': 1, '_id': 0}
+        ).batch_size(MONGODB_WRITE_CHUNK_SIZE)
+        existing_links = {doc['job_link'] for doc in cursor}
+    except Exception as e:
+        print(f"⚠️ Could not load existing job links, relying on upserts: {e}")
+        return set()
+    
+    print(f"Loaded {len(existing_links)} existing job links for these locations (Cycle {cycle})")
+    return existing_links
+
 def save_jobs_to_csv(jobs, filename=None, page_number=None, location=None):
     """Save job data to CSV file in data folder (kept for backup purposes)"""
     if not jobs:
         print("No job data to save")
         return
     
-    # Create data directory if it doesn't exist
-    # Create base data directory for scraped jobs
-    os.makedirs(SCRAPED_DATA_DIR, exist_ok=True)
-    
     # Generate filename if not provided
     if not filename:
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -585,70 +709,63 @@ def save_jobs_to_csv(jobs, filename=None, page_number=None, location=None):
     headers = ['title', 'company', 'location', 'posted_date', 'job_link']
     
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=headers)
-        writer.writeheader()
-        
-        for job in jobs:
-            # Clean and format the data
-            clean_job = {}
-            for header in headers:
-                value = job.get(header, '')
-                if isinstance(value, list):
-                    value = ', '.join(value) if value else ''
-                clean_job[header] = str(value).strip()
-            
-            writer.writerow(clean_job)
+        writer = csv.writer(csvfile)
+        writer.writerow(headers)
+        
+        # Clean and format the data as plain rows in header order
+        writer.writerows(
+            [format_csv_value(job.get(header, '')) for header in headers]
+            for job in jobs
+        )
     
     print(f"Job data saved to {filename}")
     return filename
 
-def load_all_jobs_by_clicking_see_more(page, max_clicks=10):
+async def load_all_jobs_by_clicking_see_more(page, max_clicks=10):
     """Click 'See more jobs' button multiple times to load all available jobs"""
     print(f"Loading all jobs by clicking 'See more jobs' button (max {max_clicks} clicks)...")
     
     try:
         clicks_performed = 0
         
+        # Built once and re-resolved on each use: the combined CSS selector or the
+        # role fallback, whichever visible button comes first
+        see_more_button = (
+            page.locator(SEE_MORE_SELECTOR)
+            .or_(page.locator(SEE_MORE_ROLE_SELECTOR))
+            .filter(visible=True)
+            .first
+        )
+        
         for click_attempt in range(max_clicks):
             print(f"Click attempt {click_attempt + 1}/{max_clicks}...")
             
-            # Try multiple selectors to find "See more jobs" button
-            see_more_selectors = [
-                "text=See more jobs",
-                "button:has-text('See more jobs')",
-                "span:has-text('See more jobs')",
-                "[class*='see-more']",
-                "[class*='load-more']",
-                "[data-testid*='see-more']",
-                "[data-testid*='load-more']",
-                "button:has-text('Load more')",
-                "text=Load more",
-                "text=Show more",
-                "button:has-text('Show more')"
-            ]
-            
-            button_found = False
-            for selector in see_more_selectors:
+            try:
+                # Check if button exists and is visible
+                if await see_more_button.count() == 0:
+                    print("✅ No more 'See more jobs' button found - all jobs loaded!")
+                    break
+                
+                links_before = await page.evaluate("document.links.length")
+                
+                # Try to click the button
+                await see_more_button.click()
+                print("✅ Successfully clicked 'See more jobs'")
+                clicks_performed += 1
+                
+                # A slow load after a successful click shouldn't stop pagination
                 try:
-                    # Check if button exists and is visible
-                    button_element = page.query_selector(selector)
-                    if button_element and button_element.is_visible():
-                        print(f"Found 'See more jobs' button with selector: {selector}")
-                        
-                        # Try to click the button
-                        button_element.click()
-                        page.wait_for_load_state('networkidle')
-                        print(f"✅ Successfully clicked 'See more jobs' using: {selector}")
-                        clicks_performed += 1
-                        button_found = True
-                        time.sleep(2)  # Wait for new jobs to load
-                        break
+                    await page.wait_for_load_state('networkidle')
                 except Exception as e:
-                    print(f"Failed with selector '{selector}': {e}")
-                    continue
-            
-            if not button_found:
-                print("✅ No more 'See more jobs' button found - all jobs loaded!")
+                    print(f"⚠️ Page still loading after click: {e}")
+                
+                # Wait for new jobs to load
+                try:
+                    await page.wait_for_function(MORE_LINKS_LOADED_SCRIPT, arg=links_before, timeout=5000)
+                except:
+                    pass
+            except Exception as e:
+                print(f"Failed to click 'See more jobs': {e}")
                 break
         
         print(f"✅ Completed loading all jobs. Total clicks performed: {clicks_performed}")
@@ -658,7 +775,7 @@ def load_all_jobs_by_clicking_see_more(page, max_clicks=10):
         print(f"Error loading all jobs: {e}")
         raise Exception(f"Failed to load all jobs: {e}")
 
-def navigate_to_next_page(page):
+async def navigate_to_next_page(page):
     """Navigate to the next page of job listings using AgentQL"""
     try:
         # Verify AgentQL is working
@@ -672,7 +789,7 @@ def navigate_to_next_page(page):
         }
         """
         
-        result = page.query_data(next_query)
+        result = await page.query_data(next_query)
         
         if result and 'next_button' in result and result['next_button']:
             print("Found next page button, clicking...")
@@ -683,8 +800,8 @@ def navigate_to_next_page(page):
             
             for selector in selectors_to_try:
                 try:
-                    page.click(selector)
-                    page.wait_for_load_state('networkidle')
+                    await page.click(selector)
+                    await page.wait_for_load_state('networkidle')
                     print(f"Successfully clicked next page using: {selector}")
                     return True
                 except:
@@ -700,103 +817,90 @@ def navigate_to_next_page(page):
         print(f"Error navigating to next page: {e}")
         raise Exception(f"AgentQL pagination failed: {e}")
 
-def clear_search_filters(page):
+async def clear_search_filters(page):
     """Clear any existing search filters and results"""
     print("Clearing existing search filters...")
     
     try:
-        # Try to find and click clear/reset buttons
-        clear_selectors = [
-            "text=Clear",
-            "button:has-text('Clear')",
-            "text=Reset",
-            "button:has-text('Reset')",
-            "text=Clear all",
-            "button:has-text('Clear all')",
-            "[class*='clear']",
-            "[class*='reset']"
-        ]
-        
-        for selector in clear_selectors:
-            try:
-                clear_button = page.query_selector(selector)
-                if clear_button and clear_button.is_visible():
-                    clear_button.click()
-                    print(f"✅ Clicked clear button with selector: {selector}")
-                    time.sleep(1)
-                    break
-            except:
-                continue
+        # Find and click the first visible clear/reset control in a single round trip
+        try:
+            clicked = await page.evaluate(CLEAR_FILTERS_SCRIPT)
+            if clicked:
+                print(f"✅ Clicked clear button: {clicked}")
+        except Exception as e:
+            print(f"Could not click clear button: {e}")
         
         # Also try to clear location input if it exists
-        location_input_selectors = [
-            "input[placeholder*='location' i]",
-            "input[placeholder*='city' i]", 
-            "input[placeholder*='where' i]",
-            "input[placeholder*='Location']",
-            "[class*='location'] input"
-        ]
-        
-        for selector in location_input_selectors:
+        for selector in CLEAR_LOCATION_INPUT_SELECTORS:
             try:
-                location_input = page.query_selector(selector)
-                if location_input and location_input.is_visible():
-                    location_input.clear()
+                location_input = await page.query_selector(selector)
+                if location_input and await location_input.is_visible():
+                    await location_input.clear()
                     print(f"✅ Cleared location input with selector: {selector}")
                     break
             except:
                 continue
         
-        # Wait a moment for any filters to clear
-        time.sleep(2)
+        # Wait for any filters to clear
+        await page.wait_for_load_state('networkidle')
         
     except Exception as e:
         print(f"Warning: Could not clear filters: {e}")
 
 
 
-def scrape_location(page, location, mongo_collection, date_posted_days=30, cycle=0):
-    """Scrape jobs for a specific location"""
+async def scrape_location(page, location, mongo_collection, date_posted_days=30, cycle=0, seen_links=None, search_lock=None):
+    """Scrape jobs for a specific location, skipping links in seen_links when saving to MongoDB.
+    
+    The search filters live in the logged-in session rather than the page, so concurrent
+    locations share search_lock from navigation until their results have loaded.
+    """
     print(f"\n{'='*60}")
     print(f"SCRAPING JOBS FOR: {location.upper()}")
     print(f"{'='*60}")
     
     try:
-        # Navigate to jobs page with hard refresh to clear previous search
-        print(f"Navigating to {JOBS_URL}...")
-        page.goto(JOBS_URL, wait_until='networkidle')
+        # Only one location at a time may touch the filters, or another page's clear/date/location
+        # steps can land mid-search and this location's results would belong to another city
+        async with search_lock or asyncio.Lock():
+            # Navigate to jobs page with hard refresh to clear previous search
+            print(f"Navigating to {JOBS_URL}...")
+            await page.goto(JOBS_URL, wait_until='domcontentloaded')
         
-        # Wait for jobs page to load
-        page.wait_for_selector("text=Jobs", timeout=10000)
-        print("Successfully reached the jobs page!")
+            # Wait for the jobs page itself rather than for analytics traffic to go idle
+            await page.wait_for_selector("text=Jobs", timeout=10000)
+            print("Successfully reached the jobs page!")
         
-        # Clear any existing search filters
-        clear_search_filters(page)
+            # Clear any existing search filters
+            await clear_search_filters(page)
         
-        # Set date posted filter
-        print("\n--- Setting Date Posted Filter ---")
-        if not set_date_posted_filter(page, days=date_posted_days):
-            print("❌ Failed to set date posted filter, skipping location...")
-            return 0, 0
+            # Set date posted filter
+            print("\n--- Setting Date Posted Filter ---")
+            if not await set_date_posted_filter(page, days=date_posted_days):
+                print("❌ Failed to set date posted filter, skipping location...")
+                return 0, 0
         
-        # Search for jobs in specific location - CRITICAL STEP
-        print(f"\n--- Searching for jobs in {location} ---")
-        if not search_jobs_by_location(page, location):
-            print(f"❌ Failed to search for location '{location}', skipping this location...")
-            return 0, 0
+            # Search for jobs in specific location - CRITICAL STEP
+            print(f"\n--- Searching for jobs in {location} ---")
+            if not await search_jobs_by_location(page, location):
+                print(f"❌ Failed to search for location '{location}', skipping this location...")
+                return 0, 0
         
-        # Wait for search results to load
-        print("Waiting for search results to load...")
-        time.sleep(3)
+            # Wait for search results to load
+            print("Waiting for search results to load...")
+            try:
+                await page.wait_for_selector("text=View job", timeout=10000)
+            except:
+                print("⚠️ No job cards visible yet, continuing...")
         
         # Load all jobs by clicking "See more jobs" button multiple times
         print("\n--- Loading all available jobs ---")
-        clicks_performed = load_all_jobs_by_clicking_see_more(page, max_clicks=MAX_SEE_MORE_CLICKS)
+        clicks_performed = await load_all_jobs_by_clicking_see_more(page, max_clicks=MAX_SEE_MORE_CLICKS)
         print(f"✅ Loaded all jobs with {clicks_performed} clicks")
         
         # Extract all job data at once
         print("\n--- Extracting all job data ---")
-        all_jobs = extract_job_data(page)
+        all_jobs = await extract_job_data(page)
         
         if all_jobs:
             print(f"✅ Successfully extracted {len(all_jobs)} total jobs")
@@ -807,11 +911,17 @@ def scrape_location(page, location, mongo_collection, date_posted_days=30, cycle
             
             # Save all jobs to CSV
             print("\n--- Saving jobs to CSV ---")
-            csv_file = save_jobs_to_csv(unique_jobs, location=location)
+            csv_file = await asyncio.to_thread(save_jobs_to_csv, unique_jobs, location=location)
             
-            # Save all jobs to MongoDB
+            # Save all jobs to MongoDB, except links already stored or saved by another location
             print("\n--- Saving jobs to MongoDB ---")
-            inserted_count = save_jobs_to_mongodb(unique_jobs, mongo_collection, location, cycle=cycle)
+            jobs_to_save = unique_jobs
+            if seen_links is not None:
+                jobs_to_save = [job for job in unique_jobs if job.get('job_link') not in seen_links]
+                seen_links.update(job['job_link'] for job in jobs_to_save if job.get('job_link'))
+                if len(jobs_to_save) < len(unique_jobs):
+                    print(f"⏭️ Skipped {len(unique_jobs) - len(jobs_to_save)} jobs already saved")
+            inserted_count = await asyncio.to_thread(save_jobs_to_mongodb, jobs_to_save, mongo_collection, location, cycle=cycle)
             
             print(f"\n✅ Scraping completed for {location}! Total unique jobs collected: {len(unique_jobs)}")
             print(f"📁 CSV file saved: {csv_file}")
@@ -826,6 +936,124 @@ def scrape_location(page, location, mongo_collection, date_posted_days=30, cycle
         print(f"❌ Error scraping {location}: {e}")
         return 0, 0
 
+async def scrape_location_on_new_page(context, semaphore, search_lock, storage_state, index, total, location, mongo_collection, date_posted_days, cycle, seen_links):
+    """Scrape one location on its own page once a parallel slot is free.
+    
+    Given a storage_state, the page gets its own context seeded with the login state;
+    otherwise (persistent profile) it is a page of the shared context.
+    """
+    async with semaphore:
+        print(f"\n{'='*80}")
+        print(f"PROGRESS: {index}/{total} - Processing location: {location.upper()}")
+        print(f"{'='*80}")
+        
+        location_context = context
+        if storage_state is not None:
+            location_context = await context.browser.new_context(
+                storage_state=storage_state, user_agent=BROWSER_USER_AGENT
+            )
+            await enable_resource_blocking(location_context)
+        
+        page = agentql.wrap_async(await location_context.new_page())
+        try:
+            return await scrape_location(page, location, mongo_collection, date_posted_days, cycle=cycle, seen_links=seen_links, search_lock=search_lock)
+        finally:
+            if location_context is context:
+                await page.close()
+            else:
+                await location_context.close()
+            # Keep the slot a little longer to be respectful to the server
+            await asyncio.sleep(5)
+
+async def scrape_all_locations(locations, mongo_collection, date_posted_days=30, cycle=0):
+    """Log in once, then scrape the locations in parallel, each in its own context when possible"""
+    async with async_playwright() as playwright:
+        # Try to use persistent context first
+        context, is_persistent = await setup_browser_context(playwright, persistent=True)
+        
+        # Create a new page from the context
+        playwright_page = await context.new_page()
+        
+        # Wrap the page with AgentQL
+        page = agentql.wrap_async(playwright_page)
+        
+        # Verify AgentQL wrapping worked
+        if not hasattr(page, 'query_data'):
+            raise Exception("AgentQL not properly initialized - page object missing 'query_data' method")
+        
+        try:
+            # Navigate to Greenhouse
+            print(f"Navigating to {GREENHOUSE_URL}...")
+            await page.goto(GREENHOUSE_URL, wait_until='domcontentloaded')
+            
+            # Check if we need to login
+            try:
+                await page.wait_for_selector("text=Sign in", timeout=5000)
+                print("Login required...")
+                if await manual_login_flow(page):
+                    print("Login successful!")
+                    # Save context for future use
+                    if not is_persistent:
+                        save_context_info(context)
+                        print("Context saved for future use")
+                else:
+                    print("Login failed, exiting...")
+                    return
+            except:
+                print("Already logged in or login not required")
+            
+            # Only after login, so the sign-in page (and any captcha) renders fully
+            await enable_resource_blocking(context)
+            
+            # Scrape locations in parallel, a few pages at a time
+            # Links already stored for these locations this cycle; jobs saved during the
+            # run are added as they go. Only touched on the event loop, so no lock needed
+            seen_links = await asyncio.to_thread(load_existing_job_links, mongo_collection, locations, cycle)
+            
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_LOCATIONS)
+            # Serializes the filter/search steps; loading and extracting results still overlap
+            search_lock = asyncio.Lock()
+            # A fresh login gets one context per location from its cookies; a persistent
+            # profile can't be cloned that way, so its locations share the context
+            storage_state = None if is_persistent else await context.storage_state()
+            results = await asyncio.gather(*[
+                scrape_location_on_new_page(
+                    context, semaphore, search_lock, storage_state, i, len(locations), location,
+                    mongo_collection, date_posted_days, cycle, seen_links
+                )
+                for i, location in enumerate(locations, 1)
+            ])
+            
+            total_jobs_collected = 0
+            total_jobs_inserted = 0
+            successful_locations = []
+            failed_locations = []
+            
+            for location, (jobs_count, inserted_count) in zip(locations, results):
+                if jobs_count > 0:
+                    total_jobs_collected += jobs_count
+                    total_jobs_inserted += inserted_count
+                    successful_locations.append(location)
+                else:
+                    failed_locations.append(location)
+            
+            # Final summary
+            print(f"\n{'='*80}")
+            print("SCRAPING SUMMARY")
+            print(f"{'='*80}")
+            print(f"✅ Successful locations ({len(successful_locations)}): {', '.join(successful_locations)}")
+            if failed_locations:
+                print(f"❌ Failed locations ({len(failed_locations)}): {', '.join(failed_locations)}")
+            print(f"📊 Total jobs collected: {total_jobs_collected}")
+            print(f"📊 Total jobs inserted to MongoDB: {total_jobs_inserted}")
+            print(f"📊 Database: {MONGODB_DATABASE}.{MONGODB_COLLECTION}")
+            
+        except Exception as e:
+            print(f"An error occurred: {e}")
+        finally:
+            # Close the context/browser
+            await context.close()
+
 def main():
     """Main scraping function"""
     print("Starting Greenhouse job scraper...")
@@ -906,91 +1134,18 @@ def main():
     
     # Setup MongoDB connection
     try:
-        mongo_client, mongo_collection = setup_mongodb_connection()
+        _, mongo_collection = setup_mongodb_connection()
     except Exception as e:
         print(f"❌ MongoDB setup failed: {e}")
         print("Please check your MONGODB_URI in the .env file")
         return
     
-    with sync_playwright() as playwright:
-        # Try to use persistent context first
-        context, is_persistent = setup_browser_context(playwright, persistent=True)
-        
-        # Create a new page from the context
-        playwright_page = context.new_page()
-        
-        # Wrap the page with AgentQL
-        page = agentql.wrap(playwright_page)
-        
-        # Verify AgentQL wrapping worked
-        if not hasattr(page, 'query_data'):
-            raise Exception("AgentQL not properly initialized - page object missing 'query_data' method")
-        
-        try:
-            # Navigate to Greenhouse
-            print(f"Navigating to {GREENHOUSE_URL}...")
-            page.goto(GREENHOUSE_URL)
-            
-            # Check if we need to login
-            try:
-                page.wait_for_selector("text=Sign in", timeout=5000)
-                print("Login required...")
-                if manual_login_flow(page):
-                    print("Login successful!")
-                    # Save context for future use
-                    if not is_persistent:
-                        save_context_info(context)
-                        print("Context saved for future use")
-                else:
-                    print("Login failed, exiting...")
-                    return
-            except:
-                print("Already logged in or login not required")
-            
-            # Scrape each location
-            total_jobs_collected = 0
-            total_jobs_inserted = 0
-            successful_locations = []
-            failed_locations = []
-            
-            for i, location in enumerate(locations, 1):
-                print(f"\n{'='*80}")
-                print(f"PROGRESS: {i}/{len(locations)} - Processing location: {location.upper()}")
-                print(f"{'='*80}")
-                
-                jobs_count, inserted_count = scrape_location(page, location, mongo_collection, date_posted_days, cycle=cycle)
-                
-                if jobs_count > 0:
-                    total_jobs_collected += jobs_count
-                    total_jobs_inserted += inserted_count
-                    successful_locations.append(location)
-                else:
-                    failed_locations.append(location)
-                
-                # Add delay between locations to be respectful to the server
-                if i < len(locations):
-                    print(f"\n⏳ Waiting 5 seconds before next location...")
-                    time.sleep(5)
-            
-            # Final summary
-            print(f"\n{'='*80}")
-            print("SCRAPING SUMMARY")
-            print(f"{'='*80}")
-            print(f"✅ Successful locations ({len(successful_locations)}): {', '.join(successful_locations)}")
-            if failed_locations:
-                print(f"❌ Failed locations ({len(failed_locations)}): {', '.join(failed_locations)}")
-            print(f"📊 Total jobs collected: {total_jobs_collected}")
-            print(f"📊 Total jobs inserted to MongoDB: {total_jobs_inserted}")
-            print(f"📊 Database: {MONGODB_DATABASE}.{MONGODB_COLLECTION}")
-            
-        except Exception as e:
-            print(f"An error occurred: {e}")
-        finally:
-            # Close the context/browser
-            context.close()
-            # Close MongoDB connection
-            mongo_client.close()
-            print("✅ MongoDB connection closed")
+    try:
+        asyncio.run(scrape_all_locations(locations, mongo_collection, date_posted_days, cycle))
+    finally:
+        # Close MongoDB connection
+        close_mongodb_connection()
+        print("✅ MongoDB connection closed")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 import asyncio
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 from dotenv import load_dotenv
 import logging
 
@@ -14,6 +14,12 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
+# Documents fetched per cursor round-trip; raw Jina content is large, so the
+# whole result set is never held in memory at once
+CURSOR_BATCH_SIZE = 100
+# Updates sent per bulk_write round-trip
+BULK_FLUSH_SIZE = 100
+
 def run_backfill(cycle):
     """
     Reruns the clean extraction logic on jobs that already have `jina_raw_content`
@@ -38,19 +44,22 @@ def run_backfill(cycle):
         'jina_raw_content': {'$ne': ''}
     }
     
-    jobs = list(collection.find(query, {
+    total_jobs = collection.count_documents(query)
+    
+    logger.info(f"Found {total_jobs} jobs in cycle {cycle} with raw Jina content to re-process.")
+    if total_jobs == 0:
+        return
+    
+    jobs = collection.find(query, {
         '_id': 1, 
         'title': 1, 
         'jina_raw_content': 1, 
         'jd_extraction_method': 1
-    }))
-    
-    logger.info(f"Found {len(jobs)} jobs in cycle {cycle} with raw Jina content to re-process.")
-    if len(jobs) == 0:
-        return
+    }).batch_size(CURSOR_BATCH_SIZE)
         
     updated_count = 0
     improved_count = 0
+    pending_updates = []
     
     for job in jobs:
         job_id = job['_id']
@@ -66,15 +75,20 @@ def run_backfill(cycle):
         if new_method == "clean" and old_method != "clean":
             improved_count += 1
             
-        # Safely update the DB with the new cleaned text
+        # Queue the DB update with the new cleaned text; flushed in bulk below
         update_data = {
             'job_description': description,
             'jd_extraction': jd_extraction_success,
             'jd_extraction_method': new_method
         }
         
-        collection.update_one({'_id': job_id}, {'$set': update_data})
-        updated_count += 1
+        pending_updates.append(UpdateOne({'_id': job_id}, {'$set': update_data}))
+        if len(pending_updates) >= BULK_FLUSH_SIZE:
+            updated_count += collection.bulk_write(pending_updates, ordered=False).matched_count
+            pending_updates = []
+    
+    if pending_updates:
+        updated_count += collection.bulk_write(pending_updates, ordered=False).matched_count
         
     logger.info("-" * 40)
     logger.info(f"Finished! Reprocessed {updated_count} jobs.")
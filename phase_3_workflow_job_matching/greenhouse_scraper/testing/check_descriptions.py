@@ -16,7 +16,10 @@ def check_descriptions():
         collection = db['Job_postings_greenhouse']
         
         # Find a job with description
-        job_with_desc = collection.find_one({'job_description': {'$exists': True, '$ne': ''}})
+        job_with_desc = collection.find_one(
+            {'job_description': {'$exists': True, '$ne': ''}},
+            {'title': 1, 'company': 1, 'job_description': 1}
+        )
         if job_with_desc:
             print('✅ Found job with description!')
             print(f'Title: {job_with_desc.get("title", "N/A")}')
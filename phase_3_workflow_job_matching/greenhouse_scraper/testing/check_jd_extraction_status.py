@@ -16,25 +16,23 @@ def check_jd_extraction_status():
         db = client['Resume_study']
         collection = db['Job_postings_greenhouse']
         
-        # Count total jobs
-        total = collection.count_documents({})
+        # Count total jobs (collection metadata, no scan needed for an unfiltered total)
+        total = collection.estimated_document_count()
         print(f"Total jobs: {total}")
         
-        # Count jobs with descriptions
-        with_descriptions = collection.count_documents({'job_description': {'$exists': True, '$ne': ''}})
-        print(f"Jobs with descriptions: {with_descriptions}")
-        
-        # Count jobs with jd_extraction flag
-        with_jd_flag = collection.count_documents({'jd_extraction': {'$exists': True}})
-        print(f"Jobs with jd_extraction flag: {with_jd_flag}")
-        
-        # Count successful extractions
-        successful_extractions = collection.count_documents({'jd_extraction': True})
-        print(f"Jobs with successful JD extraction: {successful_extractions}")
-        
-        # Count failed extractions
-        failed_extractions = collection.count_documents({'jd_extraction': False})
-        print(f"Jobs with failed JD extraction: {failed_extractions}")
+        # Separate counts rather than one $facet: a $facet can't use indexes and buffers
+        # whole documents, while the jd_extraction counts are served by its sparse index
+        counts = {
+            'with_descriptions': collection.count_documents({'job_description': {'$exists': True, '$ne': ''}}),
+            'with_jd_flag': collection.count_documents({'jd_extraction': {'$exists': True}}),
+            'successful_extractions': collection.count_documents({'jd_extraction': True}),
+            'failed_extractions': collection.count_documents({'jd_extraction': False}),
+        }
+        
+        print(f"Jobs with descriptions: {counts['with_descriptions']}")
+        print(f"Jobs with jd_extraction flag: {counts['with_jd_flag']}")
+        print(f"Jobs with successful JD extraction: {counts['successful_extractions']}")
+        print(f"Jobs with failed JD extraction: {counts['failed_extractions']}")
         
         # Show sample jobs
         print("\nSample jobs with jd_extraction status:")
@@ -15,34 +15,53 @@ def check_mongodb():
         db = client['Resume_study']
         collection = db['Job_postings_greenhouse']
         
-        # Check total jobs
-        total = collection.count_documents({})
+        # Check total jobs (collection metadata, no scan needed for an unfiltered total)
+        total = collection.estimated_document_count()
         print(f"Total jobs: {total}")
         
-        # Check jobs with descriptions
-        with_descriptions = collection.count_documents({'job_description': {'$exists': True, '$ne': ''}})
-        print(f"Jobs with descriptions: {with_descriptions}")
+        # Count jobs with and without descriptions in one pass. Only two flags per document
+        # reach the $group, rather than whole documents buffered for each $facet branch
+        status_counts = next(collection.aggregate([
+            {'$project': {
+                '_id': 0,
+                'has_description': {'$and': [
+                    {'$ne': [{'$type': '$job_description'}, 'missing']},
+                    {'$ne': ['$job_description', '']}
+                ]},
+                'missing_description': {'$and': [
+                    {'$ne': [{'$type': '$job_link'}, 'missing']},
+                    {'$ne': ['$job_link', '']},
+                    {'$eq': [{'$ifNull': ['$job_description', '']}, '']}
+                ]}
+            }},
+            {'$group': {
+                '_id': None,
+                'with_descriptions': {'$sum': {'$cond': ['$has_description', 1, 0]}},
+                'without_descriptions': {'$sum': {'$cond': ['$missing_description', 1, 0]}}
+            }}
+        ]), {})
+        with_descriptions = status_counts.get('with_descriptions', 0)
+        without_descriptions = status_counts.get('without_descriptions', 0)
         
-        # Check jobs without descriptions
-        without_descriptions = collection.count_documents({
-            'job_link': {'$exists': True, '$ne': ''},
-            '$or': [
-                {'job_description': {'$exists': False}},
-                {'job_description': {'$eq': ''}},
-                {'job_description': None}
-            ]
-        })
+        print(f"Jobs with descriptions: {with_descriptions}")
         print(f"Jobs without descriptions: {without_descriptions}")
         
-        # Show a sample job
-        sample = collection.find_one({})
+        # Show a sample job (field names and description length only, not the document)
+        sample = next(collection.aggregate([
+            {'$limit': 1},
+            {'$project': {
+                '_id': 0,
+                'fields': {'$map': {'input': {'$objectToArray': '$$ROOT'}, 'in': '$$this.k'}},
+                'description_length': {'$strLenCP': {'$ifNull': ['$job_description', '']}}
+            }}
+        ]), None)
         if sample:
-            print(f"Sample job fields: {list(sample.keys())}")
-            if 'job_description' in sample:
-                desc = sample.get('job_description', '')
-                print(f"Has job_description field: {bool(desc)}")
-                if desc:
-                    print(f"Description length: {len(desc)} characters")
+            print(f"Sample job fields: {sample['fields']}")
+            if 'job_description' in sample['fields']:
+                desc_length = sample['description_length']
+                print(f"Has job_description field: {bool(desc_length)}")
+                if desc_length:
+                    print(f"Description length: {desc_length} characters")
             else:
                 print("No job_description field found")
         else:
@@ -4,12 +4,28 @@ Debug the extraction logic step by step
 """
 
 import asyncio
+import re
 import aiohttp
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
+JOB_KEYWORDS = (
+    'job description', 'about the role', 'what you\'ll do',
+    'responsibilities', 'requirements', 'qualifications',
+    'what we\'re looking for', 'role overview', 'position overview',
+    'about this role', 'key responsibilities', 'job summary',
+    'role summary', 'position summary', 'we are looking for',
+    'the ideal candidate', 'you will be responsible',
+    'about you and the role', 'about the position', 'about this position',
+    'the role', 'this role', 'position details', 'job details',
+    'what you\'ll be doing', 'what you will do', 'key duties',
+    'main responsibilities', 'primary responsibilities'
+)
+# One pass per line instead of a substring test per keyword
+JOB_KEYWORD_RE = re.compile('|'.join(map(re.escape, JOB_KEYWORDS)))
+
 async def debug_extraction():
     """Debug the extraction logic step by step"""
     
@@ -30,50 +46,39 @@ async def debug_extraction():
                 description_started = False
                 description_lines = []
                 
-                job_keywords = [
-                    'job description', 'about the role', 'what you\'ll do', 
-                    'responsibilities', 'requirements', 'qualifications',
-                    'what we\'re looking for', 'role overview', 'position overview',
-                    'about this role', 'key responsibilities', 'job summary',
-                    'role summary', 'position summary', 'we are looking for',
-                    'the ideal candidate', 'you will be responsible',
-                    'about you and the role', 'about the position', 'about this position',
-                    'the role', 'this role', 'position details', 'job details',
-                    'what you\'ll be doing', 'what you will do', 'key duties',
-                    'main responsibilities', 'primary responsibilities'
-                ]
+                # Collect the per-line trace and print it in one write after the scan
+                report = []
                 
                 for i, line in enumerate(lines[:50]):  # Check first 50 lines
                     line_stripped = line.strip()
                     line_lower = line_stripped.lower()
                     
-                    print(f"Line {i}: {line_stripped[:80]}...")
+                    report.append(f"Line {i}: {line_stripped[:80]}...")
                     
                     # Skip empty lines and headers
                     if not line_stripped or line_stripped.startswith('#'):
                         if description_started:
                             description_lines.append(line_stripped)
-                            print(f"  -> Added to description (continued)")
+                            report.append(f"  -> Added to description (continued)")
                         else:
-                            print(f"  -> Skipped (empty/header, not started)")
+                            report.append(f"  -> Skipped (empty/header, not started)")
                         continue
                     
                     # Look for job description indicators
-                    found_keyword = None
-                    for keyword in job_keywords:
-                        if keyword in line_lower:
-                            found_keyword = keyword
-                            break
+                    match = JOB_KEYWORD_RE.search(line_lower)
+                    found_keyword = match.group() if match else None
                     
                     if found_keyword:
                         description_started = True
                         description_lines.append(line_stripped)
-                        print(f"  -> ✅ FOUND KEYWORD: '{found_keyword}' - Started extraction!")
+                        report.append(f"  -> ✅ FOUND KEYWORD: '{found_keyword}' - Started extraction!")
                     elif description_started and not line_stripped.startswith('#'):
                         description_lines.append(line_stripped)
-                        print(f"  -> Added to description (continued)")
+                        report.append(f"  -> Added to description (continued)")
                     else:
-                        print(f"  -> Skipped (no keyword, not started)")
+                        report.append(f"  -> Skipped (no keyword, not started)")
+                
+                print('\n'.join(report))
                 
                 # Clean up the description
                 extracted_description = '\n'.join(description_lines).strip()
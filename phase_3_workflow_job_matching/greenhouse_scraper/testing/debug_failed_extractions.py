@@ -5,86 +5,111 @@ Debug script to investigate why some job extractions are failing
 
 import asyncio
 import aiohttp
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
+MAX_CONCURRENT_REQUESTS = 20
+# Built once; every request uses the same headers and URL prefix
+JINA_HEADERS = {'Authorization': f'Bearer {os.getenv("JINAAI_API_KEY")}'}
+JINA_URL_TEMPLATE = "https://r.jina.ai/{}".format
+
+async def fetch_job_content(session, semaphore, job_url):
+    """Fetch a job through Jina AI, returning (status, content, error)"""
+    if not job_url:
+        return None, None, None
+    
+    # Test Jina AI API call
+    try:
+        async with semaphore, session.get(JINA_URL_TEMPLATE(job_url), headers=JINA_HEADERS) as response:
+            content = await response.text() if response.status == 200 else None
+            return response.status, content, None
+    except Exception as e:
+        return None, None, e
+
 async def debug_failed_extractions():
     """Debug why some extractions are failing"""
     
     # Connect to MongoDB
-    client = MongoClient(os.getenv('MONGODB_URI'))
+    client = AsyncMongoClient(os.getenv('MONGODB_URI'))
     db = client['Resume_study']
     collection = db['Job_postings_greenhouse']
     
     # Find jobs without descriptions
-    jobs_without_descriptions = list(collection.find({
+    jobs_without_descriptions = await collection.find({
         'job_link': {'$exists': True, '$ne': ''},
         '$or': [
             {'job_description': {'$exists': False}},
             {'job_description': {'$eq': ''}},
             {'job_description': None}
         ]
-    }).limit(3))  # Check first 3 failed jobs
+    }, {'job_link': 1, 'title': 1, '_id': 0}).limit(3).to_list()  # Check first 3 failed jobs; only the fields printed below
     
     print(f"Found {len(jobs_without_descriptions)} jobs without descriptions")
     print("=" * 60)
     
-    # Test each failed job
-    async with aiohttp.ClientSession() as session:
-        for i, job in enumerate(jobs_without_descriptions, 1):
-            job_url = job.get('job_link', '')
-            job_title = job.get('title', 'Unknown')
+    # Fetch every failed job concurrently, then report in order
+    # Keep-alive pool sized to the concurrency so every request reuses a warm connection
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONCURRENT_REQUESTS,
+        limit_per_host=MAX_CONCURRENT_REQUESTS,
+        keepalive_timeout=60,
+        ttl_dns_cache=300
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        results = await asyncio.gather(*(
+            fetch_job_content(session, semaphore, job.get('job_link', ''))
+            for job in jobs_without_descriptions
+        ))
+    
+    for i, (job, (status, content, error)) in enumerate(zip(jobs_without_descriptions, results), 1):
+        job_url = job.get('job_link', '')
+        job_title = job.get('title', 'Unknown')
+        
+        print(f"\n{i}. Testing: {job_title}")
+        print(f"   URL: {job_url}")
+        
+        if not job_url:
+            print("   ❌ No URL found")
+            continue
+        
+        if error:
+            print(f"   ❌ Error: {error}")
+            continue
+        
+        print(f"   HTTP Status: {status}")
+        
+        if status == 200:
+            print(f"   Content length: {len(content)} characters")
             
-            print(f"\n{i}. Testing: {job_title}")
-            print(f"   URL: {job_url}")
+            # Check if content contains job-related keywords
+            content_lower = content.lower()
+            job_keywords = ['job', 'position', 'role', 'responsibilities', 'requirements', 'qualifications']
+            found_keywords = [kw for kw in job_keywords if kw in content_lower]
+            print(f"   Job keywords found: {found_keywords}")
             
-            if not job_url:
-                print("   ❌ No URL found")
-                continue
-                
-            # Test Jina AI API call
-            jina_url = f"https://r.jina.ai/{job_url}"
-            headers = {'Authorization': f'Bearer {os.getenv("JINAAI_API_KEY")}'}
+            # Show first 300 characters
+            print(f"   First 300 chars: {content[:300]}...")
             
-            try:
-                async with session.get(jina_url, headers=headers) as response:
-                    print(f"   HTTP Status: {response.status}")
-                    
-                    if response.status == 200:
-                        content = await response.text()
-                        print(f"   Content length: {len(content)} characters")
-                        
-                        # Check if content contains job-related keywords
-                        content_lower = content.lower()
-                        job_keywords = ['job', 'position', 'role', 'responsibilities', 'requirements', 'qualifications']
-                        found_keywords = [kw for kw in job_keywords if kw in content_lower]
-                        print(f"   Job keywords found: {found_keywords}")
-                        
-                        # Show first 300 characters
-                        print(f"   First 300 chars: {content[:300]}...")
-                        
-                        # Check for common issues
-                        if len(content) < 100:
-                            print("   ⚠️ Content too short - might be blocked or empty")
-                        elif 'access denied' in content_lower or 'forbidden' in content_lower:
-                            print("   ⚠️ Access denied - job posting might be private")
-                        elif 'not found' in content_lower or '404' in content_lower:
-                            print("   ⚠️ Page not found - URL might be invalid")
-                        elif 'login' in content_lower and 'required' in content_lower:
-                            print("   ⚠️ Login required - job posting might be behind authentication")
-                        else:
-                            print("   ✅ Content looks good - extraction should work")
-                            
-                    else:
-                        print(f"   ❌ HTTP Error: {response.status}")
-                        
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
+            # Check for common issues
+            if len(content) < 100:
+                print("   ⚠️ Content too short - might be blocked or empty")
+            elif 'access denied' in content_lower or 'forbidden' in content_lower:
+                print("   ⚠️ Access denied - job posting might be private")
+            elif 'not found' in content_lower or '404' in content_lower:
+                print("   ⚠️ Page not found - URL might be invalid")
+            elif 'login' in content_lower and 'required' in content_lower:
+                print("   ⚠️ Login required - job posting might be behind authentication")
+            else:
+                print("   ✅ Content looks good - extraction should work")
+                
+        else:
+            print(f"   ❌ HTTP Error: {status}")
     
-    client.close()
+    await client.close()
 
 if __name__ == "__main__":
     asyncio.run(debug_failed_extractions())
@@ -4,12 +4,25 @@ Debug script to see what keywords are in the job content
 """
 
 import asyncio
+import re
 import aiohttp
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
+JOB_KEYWORDS = (
+    'job description', 'about the role', 'what you\'ll do',
+    'responsibilities', 'requirements', 'qualifications',
+    'what we\'re looking for', 'role overview', 'position overview',
+    'about this role', 'key responsibilities', 'job summary',
+    'role summary', 'position summary', 'we are looking for',
+    'the ideal candidate', 'you will be responsible'
+)
+JOB_KEYWORD_RE = re.compile('|'.join(map(re.escape, JOB_KEYWORDS)))
+
+JOB_TERMS = ('role', 'position', 'job', 'responsibilities', 'requirements', 'qualifications', 'skills', 'experience')
+
 async def debug_keywords():
     """Debug what keywords are in the job content"""
     
@@ -26,21 +39,21 @@ async def debug_keywords():
                 print("Looking for job description keywords in content:")
                 print("=" * 60)
                 
-                job_keywords = [
-                    'job description', 'about the role', 'what you\'ll do', 
-                    'responsibilities', 'requirements', 'qualifications',
-                    'what we\'re looking for', 'role overview', 'position overview',
-                    'about this role', 'key responsibilities', 'job summary',
-                    'role summary', 'position summary', 'we are looking for',
-                    'the ideal candidate', 'you will be responsible'
-                ]
-                
+                # One pass: keywords in the first 30 lines, and the first line (of 50) each term appears in
                 found_keywords = []
-                for i, line in enumerate(lines[:30]):  # Check first 30 lines
+                found_terms = {}
+                for i, line in enumerate(lines[:50]):
                     line_lower = line.lower()
-                    for keyword in job_keywords:
-                        if keyword in line_lower:
-                            found_keywords.append((keyword, i, line.strip()[:100]))
+                    line_preview = line.strip()[:100]
+                    # The compiled regex rejects most lines before the per-keyword listing
+                    if i < 30 and JOB_KEYWORD_RE.search(line_lower):
+                        for keyword in JOB_KEYWORDS:
+                            if keyword in line_lower:
+                                found_keywords.append((keyword, i, line_preview))
+                    # Check if there are any job-related terms at all
+                    for term in JOB_TERMS:
+                        if term not in found_terms and term in line_lower:
+                            found_terms[term] = line_preview
                 
                 if found_keywords:
                     print("Found keywords:")
@@ -52,17 +65,8 @@ async def debug_keywords():
                     for i, line in enumerate(lines[:20]):
                         print(f"  {i}: {line.strip()[:100]}...")
                 
-                # Check if there are any job-related terms at all
-                job_terms = ['role', 'position', 'job', 'responsibilities', 'requirements', 'qualifications', 'skills', 'experience']
-                found_terms = []
-                for line in lines[:50]:
-                    line_lower = line.lower()
-                    for term in job_terms:
-                        if term in line_lower and term not in [t[0] for t in found_terms]:
-                            found_terms.append((term, line.strip()[:100]))
-                
                 print(f"\nFound job-related terms:")
-                for term, line_content in found_terms[:10]:  # Show first 10
+                for term, line_content in list(found_terms.items())[:10]:  # Show first 10
                     print(f"  '{term}' in '{line_content}...'")
 
 if __name__ == "__main__":
@@ -16,11 +16,18 @@ def show_clean_extractions():
         db = client['Resume_study']
         collection = db['Job_postings_greenhouse']
         
-        # Get jobs with clean extractions
-        clean_jobs = list(collection.find(
-            {'jd_extraction': True}, 
-            {'title': 1, 'company': 1, 'job_description': 1}
-        ).limit(3))
+        # Get jobs with clean extractions; the server returns only the length and a
+        # 400-character preview of each description
+        clean_jobs = list(collection.aggregate([
+            {'$match': {'jd_extraction': True}},
+            {'$limit': 3},
+            {'$project': {
+                'title': 1,
+                'company': 1,
+                'desc_len': {'$strLenCP': {'$ifNull': ['$job_description', '']}},
+                'desc_preview': {'$substrCP': [{'$ifNull': ['$job_description', '']}, 0, 400]}
+            }}
+        ]))
         
         print("Sample Clean Extractions with Titles:")
         print("=" * 60)
@@ -28,13 +35,13 @@ def show_clean_extractions():
         for i, job in enumerate(clean_jobs, 1):
             title = job.get('title', 'Unknown')
             company = job.get('company', 'Unknown')
-            description = job.get('job_description', '')
+            description = job.get('desc_preview', '')
             
             print(f"\n{i}. {title} | {company}")
-            print(f"Description length: {len(description)} characters")
+            print(f"Description length: {job.get('desc_len', 0)} characters")
             print("First 400 characters:")
             print("-" * 40)
-            print(description[:400])
+            print(description)
             print("-" * 40)
             
             # Check if title is at the start
@@ -1,9 +1,11 @@
 import os
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+from urllib.parse import urlparse
+from typing import List, Optional, Tuple, Dict, Any, Union
 
 from dotenv import load_dotenv
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
@@ -13,7 +15,7 @@ from bson import ObjectId
 import logging
 
 # ... imports ...
-from config import MONGODB_URI, MONGODB_DATABASE, MONGODB_COLLECTION, DEFAULT_VERIFICATION_FILTER
+from config import MONGODB_URI, MONGODB_DATABASE, MONGODB_COLLECTION, DEFAULT_VERIFICATION_FILTER, ANALYTICS_HOSTS
 import logging
 
 # Load environment variables
@@ -37,7 +39,21 @@ logger = logging.getLogger(__name__)
 # Browser settings
 HEADLESS = True
 TIMEOUT = 15000  # ms
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
 MAX_RETRIES = 2
+FORM_WAIT_TIMEOUT = 3000  # ms to wait for the application form to attach
+FORM_SETTLE_INTERVAL = 0.2  # seconds between label-count samples
+FORM_SETTLE_MAX_SAMPLES = 8
+
+# Requests that never affect form labels; aborted to cut page-load bytes.
+# Stylesheets are kept because label visibility (innerText) depends on CSS.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+# Subdomain suffixes of ANALYTICS_HOSTS, for a single str.endswith check
+ANALYTICS_HOST_SUFFIXES = tuple(f".{host}" for host in ANALYTICS_HOSTS)
 
 # Unsupported input field patterns configuration
 UNSUPPORTED_INPUT_FIELD_PATTERNS = [
@@ -169,6 +185,43 @@ def collect_form_labels(page, unsupported_patterns: List[str]) -> Tuple[List[str
     return fields, unsupported_input_fields, unsupported_field_labels
 
 
+def is_analytics_url(url: str) -> bool:
+    """True when the URL's host (not its path or query) is a tracker host."""
+    hostname = urlparse(url).hostname or ""
+    return hostname in ANALYTICS_HOSTS or hostname.endswith(ANALYTICS_HOST_SUFFIXES)
+
+
+def block_non_essential_requests(route) -> None:
+    """Playwright route handler that aborts images, media, fonts and trackers."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or is_analytics_url(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def wait_for_form_ready(page) -> None:
+    """
+    Wait until the application form is attached and its labels stop changing.
+
+    Replaces a fixed post-navigation sleep: returns as soon as the label count
+    is stable across two consecutive samples, and gives up quietly on pages
+    without a form so the caller still collects whatever is there.
+    """
+    try:
+        page.wait_for_selector("form label, form legend", state="attached", timeout=FORM_WAIT_TIMEOUT)
+    except PlaywrightTimeoutError:
+        return
+
+    previous_count = -1
+    for _ in range(FORM_SETTLE_MAX_SAMPLES):
+        count = page.evaluate("() => document.querySelectorAll('form label, form legend').length")
+        if count == previous_count:
+            return
+        previous_count = count
+        time.sleep(FORM_SETTLE_INTERVAL)
+
+
 def check_unsupported_fields_from_labels(
     labels: List[str], 
     unsupported_patterns: List[str]
@@ -202,15 +255,39 @@ def check_unsupported_fields_from_labels(
     unsupported_input_fields = len(unsupported_field_labels) > 0
     return unsupported_input_fields, unsupported_field_labels
 
+def build_result(
+    job_id: str,
+    job_title: str,
+    company: str,
+    job_url: str,
+    labels: List[str],
+    unsupported_input_fields: bool,
+    unsupported_field_labels: List[str]
+) -> Dict[str, Any]:
+    """Build the per-job result record shared by the existing-label and scrape paths."""
+    return {
+        "job_id": job_id,
+        "job_title": job_title,
+        "company": company,
+        "job_link": job_url,
+        "input_field_labels": labels,
+        "unsupported_input_fields": unsupported_input_fields,
+        "unsupported_input_field_labels": unsupported_field_labels,
+        "checked_at": datetime.utcnow().isoformat()
+    }
+
 class RequiredFieldChecker:
     def __init__(self, cycle: float = 0):
         self.mongo_client: Optional[MongoClient] = None
         self.collection = None
-        self.results: List[Dict[str, Any]] = []
+        self.results_file = None
+        self.results_path: Optional[Path] = None
+        self.results_written = 0
         self.processed_count = 0
         self.error_count = 0
         self.unsupported_input_fields_count = 0
         self.total_jobs_considered = 0
+        self.total_cycle_jobs: Optional[int] = None
         self.jobs_using_existing_labels = 0
         self.jobs_scraped = 0
         
@@ -301,90 +378,76 @@ class RequiredFieldChecker:
             logger.error(f"Error finding jobs: {e}")
             return []
 
-    def process_job(self, job: Dict[str, Any], browser) -> Optional[Dict[str, Any]]:
+    def process_job(self, job: Dict[str, Any], context) -> Optional[Dict[str, Any]]:
         job_id = str(job["_id"])
         job_url = job.get("job_link")
         job_title = job.get("title", "Unknown")
         company = job.get("company", "Unknown")
         existing_labels = job.get("input_field_labels")
 
-        logger.info(f"Processing job {job_id}: {job_title} at {company}")
+        logger.info("Processing job %s: %s at %s", job_id, job_title, company)
 
         if not job_url:
-            logger.warning(f"Job {job_id} has no job_link; skipping")
+            logger.warning("Job %s has no job_link; skipping", job_id)
             return None
 
         # If input_field_labels already exists, use them without scraping
         if existing_labels and isinstance(existing_labels, list):
             self.jobs_using_existing_labels += 1
             logger.info(
-                f"Using existing input_field_labels for job {job_id} "
-                f"({len(existing_labels)} labels found, skipping scrape)"
+                "Using existing input_field_labels for job %s "
+                "(%d labels found, skipping scrape)",
+                job_id,
+                len(existing_labels)
             )
             unsupported_input_fields, unsupported_field_labels = check_unsupported_fields_from_labels(
                 existing_labels, UNSUPPORTED_INPUT_FIELD_PATTERNS
             )
-            result = {
-                "job_id": job_id,
-                "job_title": job_title,
-                "company": company,
-                "job_link": job_url,
-                "input_field_labels": existing_labels,
-                "unsupported_input_fields": unsupported_input_fields,
-                "unsupported_input_field_labels": unsupported_field_labels,
-                "checked_at": datetime.utcnow().isoformat()
-            }
+            result = build_result(
+                job_id, job_title, company, job_url,
+                existing_labels, unsupported_input_fields, unsupported_field_labels
+            )
             logger.info(
-                f"Checked existing labels for job {job_id} "
-                f"(Unsupported fields: {unsupported_input_fields}, "
-                f"Count: {len(unsupported_field_labels)})"
+                "Checked existing labels for job %s (Unsupported fields: %s, Count: %d)",
+                job_id,
+                unsupported_input_fields,
+                len(unsupported_field_labels)
             )
             return result
 
         # No existing labels, need to scrape
         self.jobs_scraped += 1
-        logger.info(f"Scraping input_field_labels for job {job_id} (no existing labels found)")
+        logger.info("Scraping input_field_labels for job %s (no existing labels found)", job_id)
         for attempt in range(1, MAX_RETRIES + 1):
-            page = browser.new_page()
+            page = context.new_page()
             try:
-                page.set_extra_http_headers({
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/120.0.0.0 Safari/537.36"
-                    )
-                })
-                logger.debug(f"Navigating to {job_url} (attempt {attempt}/{MAX_RETRIES})")
+                logger.debug("Navigating to %s (attempt %d/%d)", job_url, attempt, MAX_RETRIES)
                 page.goto(job_url, timeout=TIMEOUT, wait_until="domcontentloaded")
-                time.sleep(1.5)
+                wait_for_form_ready(page)
 
                 labels, unsupported_input_fields, unsupported_field_labels = collect_form_labels(
                     page, UNSUPPORTED_INPUT_FIELD_PATTERNS
                 )
-                result = {
-                    "job_id": job_id,
-                    "job_title": job_title,
-                    "company": company,
-                    "job_link": job_url,
-                    "input_field_labels": labels,
-                    "unsupported_input_fields": unsupported_input_fields,
-                    "unsupported_input_field_labels": unsupported_field_labels,
-                    "checked_at": datetime.utcnow().isoformat()
-                }
+                result = build_result(
+                    job_id, job_title, company, job_url,
+                    labels, unsupported_input_fields, unsupported_field_labels
+                )
 
                 logger.info(
-                    f"Collected {len(labels)} labels for job {job_id} "
-                    f"(Unsupported fields: {unsupported_input_fields}, "
-                    f"Count: {len(unsupported_field_labels)})"
+                    "Collected %d labels for job %s (Unsupported fields: %s, Count: %d)",
+                    len(labels),
+                    job_id,
+                    unsupported_input_fields,
+                    len(unsupported_field_labels)
                 )
                 return result
 
             except PlaywrightTimeoutError:
-                logger.warning(f"Timeout loading {job_url} for job {job_id} (attempt {attempt})")
+                logger.warning("Timeout loading %s for job %s (attempt %d)", job_url, job_id, attempt)
                 if attempt == MAX_RETRIES:
                     self.error_count += 1
             except Exception as exc:
-                logger.error(f"Error processing job {job_id}: {exc}")
+                logger.error("Error processing job %s: %s", job_id, exc)
                 if attempt == MAX_RETRIES:
                     self.error_count += 1
             finally:
@@ -392,6 +455,12 @@ class RequiredFieldChecker:
                     page.close()
                 except Exception:
                     pass
+                # Keep jobs isolated without paying for a new context each time; cleared
+                # separately so a failed page.close() can't leak cookies into the next job
+                try:
+                    context.clear_cookies()
+                except Exception as exc:
+                    logger.warning("Could not clear cookies after job %s: %s", job_id, exc)
 
             time.sleep(1)
 
@@ -399,7 +468,7 @@ class RequiredFieldChecker:
 
     def update_job_document(
         self, 
-        job_id: str, 
+        job_id: Union[str, ObjectId], 
         labels: List[str], 
         unsupported_input_fields: bool,
         unsupported_field_labels: List[str]
@@ -410,40 +479,61 @@ class RequiredFieldChecker:
             "unsupported_input_field_labels": unsupported_field_labels,
             "required_fields_checked_at": datetime.utcnow()
         }
+        # Callers normally pass the ObjectId from the fetched document; only
+        # re-parse when handed its string form.
+        if not isinstance(job_id, ObjectId):
+            job_id = ObjectId(job_id)
         result = self.collection.update_one(
-            {"_id": ObjectId(job_id)},
+            {"_id": job_id},
             {"$set": update_data}
         )
         if result.modified_count > 0:
-            logger.debug(f"Updated job {job_id} with required field data")
+            logger.debug("Updated job %s with required field data", job_id)
         else:
-            logger.warning(f"No MongoDB changes made for job {job_id}")
-
-    def save_results_to_json(self, filename: Optional[str] = None) -> Optional[str]:
-        if not self.results:
-            logger.info("No results to save")
-            return None
+            logger.warning("No MongoDB changes made for job %s", job_id)
 
+    def open_results_file(self, filename: Optional[str] = None) -> Path:
+        """Open the JSON Lines results file that run() appends to as jobs finish."""
         data_dir = Path("data")
         data_dir.mkdir(exist_ok=True)
 
         if not filename:
-            filename = f"required_fields_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"required_fields_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+        self.results_path = data_dir / filename
+        self.results_file = open(self.results_path, "w", encoding="utf-8")
+        self.results_written = 0
+        return self.results_path
 
-        filepath = data_dir / filename
-        with open(filepath, "w", encoding="utf-8") as json_file:
-            json.dump(self.results, json_file, indent=2)
+    def write_result(self, result: Dict[str, Any]):
+        """Append one result and flush so partial runs keep their output."""
+        self.results_file.write(json.dumps(result) + "\n")
+        self.results_file.flush()
+        self.results_written += 1
 
-        logger.info(f"Results saved to {filepath}")
-        return str(filepath)
+    def close_results_file(self) -> Optional[str]:
+        if self.results_file is None:
+            return None
+
+        self.results_file.close()
+        self.results_file = None
+
+        if not self.results_written:
+            self.results_path.unlink(missing_ok=True)
+            logger.info("No results to save")
+            return None
+
+        logger.info("Results saved to %s", self.results_path)
+        return str(self.results_path)
    
     def run(self, limit: Optional[int] = None, skip_processed: bool = True):
         start_time = time.time()
         self.setup_mongodb_connection()
         
-        # Diagnostic print
-        total_cycle_jobs = self.collection.count_documents(self.job_filter)
-        print(f"📊 Diagnostic: Found {total_cycle_jobs} total jobs for Cycle {self.cycle}")
+        # Diagnostic print (main() may already have counted during its pre-check)
+        if self.total_cycle_jobs is None:
+            self.total_cycle_jobs = self.collection.count_documents(self.job_filter)
+        print(f"📊 Diagnostic: Found {self.total_cycle_jobs} total jobs for Cycle {self.cycle}")
         
         jobs = self.get_jobs_to_process(limit=limit, skip_processed=skip_processed)
         
@@ -453,15 +543,19 @@ class RequiredFieldChecker:
 
         with sync_playwright() as playwright:
             browser = playwright.chromium.launch(headless=HEADLESS)
+            # One context for the whole run; each job gets its own page
+            context = browser.new_context(user_agent=USER_AGENT)
+            context.route("**/*", block_non_essential_requests)
+            self.open_results_file()
             try:
                 for index, job in enumerate(jobs, start=1):
-                    result = self.process_job(job, browser)
+                    result = self.process_job(job, context)
                     if result:
                         self.processed_count += 1
-                        self.results.append(result)
+                        self.write_result(result)
                         try:
                             self.update_job_document(
-                                result["job_id"],
+                                job["_id"],
                                 result["input_field_labels"],
                                 result["unsupported_input_fields"],
                                 result["unsupported_input_field_labels"]
@@ -480,13 +574,13 @@ class RequiredFieldChecker:
                         time.sleep(1)
             finally:
                 browser.close()
+                self.close_results_file()
         
         # ... stats logging ...
         duration = time.time() - start_time
         logger.info("=" * 60)
         logger.info(f"✅ Required field extraction completed for Cycle {self.cycle}")
         # ... rest of logging ...
-        self.save_results_to_json()
         if self.mongo_client:
             self.mongo_client.close()
 
@@ -517,14 +611,17 @@ def main():
     try:
         checker.setup_mongodb_connection()
         
-        # Pre-check counts
-        total_cycle_jobs = checker.collection.count_documents(checker.job_filter)
-        print(f"\nDiagnostic: Total jobs for Cycle {checker.cycle}: {total_cycle_jobs}")
+        # Pre-check counts and whether we have work to do; the two queries are
+        # independent, so issue them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            count_future = executor.submit(checker.collection.count_documents, checker.job_filter)
+            jobs_future = executor.submit(checker.get_jobs_to_process, limit=1, skip_processed=True)
+            checker.total_cycle_jobs = count_future.result()
+            jobs = jobs_future.result()
+        print(f"\nDiagnostic: Total jobs for Cycle {checker.cycle}: {checker.total_cycle_jobs}")
 
         skip_processed = True
         
-        # Check if we have work to do
-        jobs = checker.get_jobs_to_process(limit=1, skip_processed=True)
         if not jobs:
             choice = input(f"All jobs for Cycle {cycle} seem processed. Reprocess ALL? (y/N): ").strip().lower()
             skip_processed = False if choice == "y" else True